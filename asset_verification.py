@@ -0,0 +1,117 @@
+import csv
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urljoin
+import httpx
+from settings import BASE_URL
+from tracing import traced
+
+ASSET_FIELDS = ['name', 'image_url', 'resolved_url', 'status', 'size', 'content_type', 'from_cache', 'error']
+
+def load_asset_cache(cache_file):
+    """Load cached validators and results keyed by resolved URL"""
+    if not os.path.exists(cache_file):
+        return {}
+    try:
+        with open(cache_file, 'r') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logging.warning(f"Ignoring unreadable asset cache {cache_file}: {str(e)}")
+        return {}
+
+def save_asset_cache(cache, cache_file):
+    os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+    with open(cache_file, 'w') as f:
+        json.dump(cache, f, indent=2)
+
+def check_asset(client, url, cached):
+    """GET one asset, revalidating with ETag / Last-Modified when a cached entry exists"""
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    try:
+        response = client.get(url, headers=headers)
+    except (httpx.HTTPError, httpx.InvalidURL) as e:
+        # InvalidURL (a malformed image_url) is not an HTTPError subclass
+        return {'status': None, 'size': None, 'content_type': None, 'from_cache': False, 'error': f"{type(e).__name__}: {e}"}
+
+    if response.status_code == 304 and cached:
+        return {**cached, 'from_cache': True, 'error': None}
+
+    return {
+        'status': response.status_code,
+        'size': len(response.content),
+        'content_type': response.headers.get('content-type', '').split(';')[0].strip(),
+        'etag': response.headers.get('etag'),
+        'last_modified': response.headers.get('last-modified'),
+        'checked_at': datetime.now().isoformat(),
+        'from_cache': False,
+        'error': None,
+    }
+
+def is_valid_image(result):
+    return result['status'] == 200 and bool(result['size']) and (result['content_type'] or '').startswith('image/')
+
+@traced("verify_product_assets")
+def verify_product_assets(csv_file='products.csv', output_file='product_assets.csv',
+                          cache_file='cache/asset_cache.json', base_url=BASE_URL, max_workers=8, timeout=10.0):
+    """Check every scraped image_url concurrently and record status, size and type per asset"""
+    with open(csv_file, 'r', newline='', encoding='utf-8') as f:
+        products = list(csv.DictReader(f))
+
+    for product in products:
+        product['resolved_url'] = ''
+        product['url_error'] = None
+        if not product['image_url']:
+            continue
+        try:
+            product['resolved_url'] = urljoin(f'{base_url}/', product['image_url'])
+        except ValueError as e:
+            # e.g. "Invalid IPv6 URL"; recorded on the row instead of aborting the stage
+            product['url_error'] = f"{type(e).__name__}: {e}"
+    urls = sorted({product['resolved_url'] for product in products if product['resolved_url']})
+    logging.info(f"Verifying {len(urls)} unique product image assets")
+
+    cache = load_asset_cache(cache_file)
+    limits = httpx.Limits(max_connections=max_workers, max_keepalive_connections=max_workers)
+    with httpx.Client(limits=limits, timeout=timeout, follow_redirects=True) as client:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = dict(zip(urls, executor.map(lambda url: check_asset(client, url, cache.get(url)), urls)))
+
+    for url, result in results.items():
+        if result['status'] is not None:
+            cache[url] = {key: value for key, value in result.items() if key not in ('from_cache', 'error')}
+    save_asset_cache(cache, cache_file)
+
+    rows = []
+    broken = []
+    for product in products:
+        result = results.get(product['resolved_url'])
+        if result is None:
+            result = {'status': None, 'size': None, 'content_type': None, 'from_cache': False,
+                      'error': product['url_error'] or "Missing image_url"}
+        row = {field: result.get(field) for field in ASSET_FIELDS}
+        row.update({'name': product['name'], 'image_url': product['image_url'], 'resolved_url': product['resolved_url']})
+        rows.append(row)
+        if not is_valid_image(result):
+            broken.append(row)
+
+    with open(output_file, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=ASSET_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    revalidated = sum(1 for result in results.values() if result['from_cache'])
+    logging.info(f"Saved asset results to {output_file} ({revalidated}/{len(urls)} unchanged since last run)")
+
+    for row in broken:
+        logging.error(f"Broken image for {row['name']}: {row['resolved_url']} "
+                      f"(status {row['status']}, type {row['content_type']}, error {row['error']})")
+    return rows, broken
@@ -6,9 +6,13 @@ import json
 import os
 from datetime import datetime
 from models.product_search import ProductSearchConfig
-from decimal import Decimal
+from money import parse_cents, to_cents, format_cents
+from tracing import traced, export_trace
+from settings import BASE_URL
+from browser_session import no_cache_key
 
 @task
+@traced("setup_environment")
 def setup_environment():
     """Set up the test environment"""
     logger = get_run_logger()
@@ -21,6 +25,7 @@ def setup_environment():
     return True
 
 @task(retries=3, retry_delay_seconds=5)
+@traced("load_and_validate_config")
 def load_and_validate_config():
     """Load and validate the test configuration"""
     logger = get_run_logger()
@@ -35,11 +40,16 @@ def load_and_validate_config():
         logger.error(f"Configuration validation failed: {str(e)}")
         raise
 
-@task
-def create_browser_session():
-    """Create a new browser session"""
+@task(cache_key_fn=no_cache_key)
+@traced("create_browser_session")
+def create_browser_session(browser=None):
+    """Create a new browser session, or a fresh page on an already running browser"""
     logger = get_run_logger()
     try:
+        if browser is not None:
+            page = browser.new_page()
+            logger.info("Page opened on warm browser")
+            return None, browser, page
         playwright = sync_playwright().start()
         browser = playwright.chromium.launch(headless=False)
         page = browser.new_page()
@@ -50,13 +60,14 @@ def create_browser_session():
         raise
 
 @task
-def login_to_website(page, username="standard_user", password="secret_sauce"):
+@traced("login_to_website")
+def login_to_website(page, username="standard_user", password="secret_sauce", base_url=BASE_URL):
     """Login to the website"""
     logger = get_run_logger()
     
     try:
         logger.info("Navigating to website")
-        page.goto('https://www.saucedemo.com/')
+        page.goto(f'{base_url}/')
         
         logger.info("Filling login form")
         page.fill('#user-name', username)
@@ -78,6 +89,7 @@ def login_to_website(page, username="standard_user", password="secret_sauce"):
         raise
 
 @task
+@traced("find_product")
 def find_product(page, product_name):
     """Find a specific product on the page"""
     logger = get_run_logger()
@@ -100,6 +112,7 @@ def find_product(page, product_name):
         raise
 
 @task
+@traced("verify_product_details")
 def verify_product_details(page, product, expected_price, expected_description):
     """Verify product price and description"""
     logger = get_run_logger()
@@ -107,10 +120,11 @@ def verify_product_details(page, product, expected_price, expected_description):
     try:
         # Verify price
         price_text = product.locator('.inventory_item_price').text_content()
-        actual_price = Decimal(price_text.replace('$', ''))
+        actual_cents = parse_cents(price_text)
+        expected_cents = to_cents(expected_price)
         
-        if actual_price != expected_price:
-            raise ValueError(f"Price mismatch. Expected: ${expected_price}, Got: ${actual_price}")
+        if actual_cents != expected_cents:
+            raise ValueError(f"Price mismatch. Expected: {format_cents(expected_cents)}, Got: {format_cents(actual_cents)}")
         
         # Click to view details and wait for navigation
         logger.info("Clicking product to view details")
@@ -138,6 +152,7 @@ def verify_product_details(page, product, expected_price, expected_description):
         raise
 
 @task
+@traced("capture_screenshot")
 def capture_screenshot(page, test_name):
     """Capture screenshot of the current page"""
     logger = get_run_logger()
@@ -153,10 +168,15 @@ def capture_screenshot(page, test_name):
         raise
 
 @task
-def cleanup_browser_session(playwright, browser):
-    """Clean up browser resources"""
+@traced("cleanup_browser_session")
+def cleanup_browser_session(playwright, browser, page=None):
+    """Clean up browser resources; a warm browser (no playwright handle) only loses its page"""
     logger = get_run_logger()
     try:
+        if playwright is None:
+            page.context.close()
+            logger.info("Warm browser page closed")
+            return
         browser.close()
         playwright.stop()
         logger.info("Browser session cleaned up successfully")
@@ -165,7 +185,8 @@ def cleanup_browser_session(playwright, browser):
         raise
 
 @flow(name="Product Search Automation")
-def product_search_workflow():
+@traced("product_search_workflow")
+def product_search_workflow(browser=None, base_url=BASE_URL):
     """Main workflow for product search automation"""
     logger = get_run_logger()
     
@@ -178,11 +199,11 @@ def product_search_workflow():
         search_config = config.product_search
         
         # Create browser session
-        playwright, browser, page = create_browser_session()
+        playwright, browser, page = create_browser_session(browser)
         
         try:
             # Login to website
-            login_to_website(page)
+            login_to_website(page, base_url=base_url)
             
             # Find product
             product = find_product(page, search_config.name)
@@ -207,11 +228,14 @@ def product_search_workflow():
             raise
         finally:
             # Clean up browser session
-            cleanup_browser_session(playwright, browser)
+            cleanup_browser_session(playwright, browser, page)
             
     except Exception as e:
         logger.error(f"Workflow failed: {str(e)}")
         raise
 
 if __name__ == "__main__":
-    product_search_workflow() 
\ No newline at end of file
+    try:
+        product_search_workflow()
+    finally:
+        export_trace() 
\ No newline at end of file
@@ -0,0 +1,310 @@
+import argparse
+import csv
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from importlib import metadata
+from playwright.sync_api import sync_playwright
+from stand_in_server import start_stand_in_server
+from load_test import percentile
+import tracing
+import test_cart
+import test_product_data
+import automation_workflow
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Register a benchmark; it receives the environment and repetition count and returns samples in ms"""
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+def measure(samples, func, *args, **kwargs):
+    """Call func once, appending its wall time in ms to samples"""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    samples.append((time.perf_counter() - start) * 1000)
+    return result
+
+def load_catalog(csv_file='products.csv'):
+    """Every product from the scraped CSV as an add_items_to_cart item"""
+    with open(csv_file, 'r', newline='', encoding='utf-8') as f:
+        return [{'name': row['name'], 'expected_price': row['price']} for row in csv.DictReader(f)]
+
+class BenchEnv:
+    """Shared state for one benchmark run: a warm browser, the app URL and a scratch directory"""
+
+    def __init__(self, playwright, browser, base_url, scratch_dir):
+        self.playwright = playwright
+        self.browser = browser
+        self.base_url = base_url
+        self.scratch_dir = scratch_dir
+
+    def logged_in_page(self):
+        context = self.browser.new_context()
+        page = context.new_page()
+        test_cart.login(page, 'standard_user', 'secret_sauce', self.base_url)
+        return context, page
+
+@benchmark("browser_launch")
+def bench_browser_launch(env, repetitions):
+    samples = []
+    for _ in range(repetitions):
+        browser = measure(samples, env.playwright.chromium.launch, headless=True)
+        browser.close()
+    return samples
+
+@benchmark("context_creation")
+def bench_context_creation(env, repetitions):
+    samples = []
+    for _ in range(repetitions):
+        start = time.perf_counter()
+        context = env.browser.new_context()
+        context.new_page()
+        samples.append((time.perf_counter() - start) * 1000)
+        context.close()
+    return samples
+
+@benchmark("login")
+def bench_login(env, repetitions):
+    samples = []
+    for _ in range(repetitions):
+        context = env.browser.new_context()
+        page = context.new_page()
+        measure(samples, test_cart.login, page, 'standard_user', 'secret_sauce', env.base_url)
+        context.close()
+    return samples
+
+@benchmark("scrape_extraction")
+def bench_scrape_extraction(env, repetitions):
+    context, page = env.logged_in_page()
+    samples = []
+    for _ in range(repetitions):
+        measure(samples, test_product_data.extract_product_data, page)
+    context.close()
+    return samples
+
+@benchmark("add_to_cart_per_item")
+def bench_add_to_cart_per_item(env, repetitions):
+    items = load_catalog()
+    samples = []
+    for _ in range(repetitions):
+        context, page = env.logged_in_page()
+        start = time.perf_counter()
+        test_cart.add_items_to_cart(page, items)
+        samples.append((time.perf_counter() - start) * 1000 / len(items))
+        context.close()
+    return samples
+
+@benchmark("checkout")
+def bench_checkout(env, repetitions):
+    items = load_catalog()[:2]
+    checkout_case = {'name': 'benchmark_checkout', 'expected_result': 'success'}
+    samples = []
+    for _ in range(repetitions):
+        context, page = env.logged_in_page()
+        total = test_cart.seed_cart(page, items, env.base_url)
+        measure(samples, test_cart.perform_checkout, page, checkout_case, total)
+        context.close()
+    return samples
+
+@benchmark("screenshot")
+def bench_screenshot(env, repetitions):
+    context, page = env.logged_in_page()
+    path = os.path.join(env.scratch_dir, 'benchmark.png')
+    samples = []
+    for _ in range(repetitions):
+        measure(samples, page.screenshot, path=path)
+    context.close()
+    return samples
+
+@benchmark("logging_per_call")
+def bench_logging_per_call(env, repetitions, calls=1000):
+    """File + formatter logging as configured by the suites, per logging.info call"""
+    logger = logging.getLogger('benchmark.logging')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = logging.FileHandler(os.path.join(env.scratch_dir, 'benchmark.log'))
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+
+    samples = []
+    try:
+        for _ in range(repetitions):
+            start = time.perf_counter()
+            for i in range(calls):
+                logger.info(f"Benchmark log line {i}")
+            samples.append((time.perf_counter() - start) * 1000 / calls)
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+    return samples
+
+@benchmark("span_overhead_disabled")
+def bench_span_overhead_disabled(env, repetitions, calls=100000):
+    was_enabled = tracing.is_tracing_enabled()
+    tracing.enable_tracing(False)
+    samples = []
+    try:
+        for _ in range(repetitions):
+            start = time.perf_counter()
+            for _ in range(calls):
+                with tracing.span("noop"):
+                    pass
+            samples.append((time.perf_counter() - start) * 1000 / calls)
+    finally:
+        tracing.enable_tracing(was_enabled)
+    return samples
+
+@benchmark("product_search_workflow")
+def bench_product_search_workflow(env, repetitions):
+    """The whole Prefect flow on the warm browser; skipped when its config file is absent"""
+    if not os.path.exists('test_data/product_search_config.json'):
+        logging.warning("Skipping product_search_workflow: test_data/product_search_config.json not found")
+        return None
+    samples = []
+    for _ in range(repetitions):
+        measure(samples, automation_workflow.product_search_workflow, browser=env.browser, base_url=env.base_url)
+    return samples
+
+def summarize_samples(samples):
+    ordered = sorted(samples)
+    return {
+        'unit': 'ms',
+        'samples': [round(value, 4) for value in samples],
+        'min': round(ordered[0], 4),
+        'median': round(statistics.median(ordered), 4),
+        'mean': round(statistics.fmean(ordered), 4),
+        'p95': round(percentile(ordered, 95), 4),
+        'stdev': round(statistics.stdev(ordered), 4) if len(ordered) > 1 else 0.0,
+    }
+
+def git_revision():
+    """Current commit hash and whether the working tree has uncommitted changes"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                    capture_output=True, text=True, check=True).stdout.strip())
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+
+def run_benchmarks(names=None, repetitions=5, warmup=1, base_url=None):
+    """Run the selected benchmarks against base_url (or a freshly started stand-in app)"""
+    names = names or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks {unknown}; expected any of {list(BENCHMARKS)}")
+
+    server = None
+    if base_url is None:
+        server, base_url = start_stand_in_server()
+
+    commit, dirty = git_revision()
+    report = {
+        'commit': commit,
+        'dirty': dirty,
+        'timestamp': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'playwright': metadata.version('playwright'),
+        'base_url': base_url,
+        'repetitions': repetitions,
+        'warmup': warmup,
+        'results': {},
+    }
+
+    try:
+        with sync_playwright() as p, tempfile.TemporaryDirectory() as scratch_dir:
+            browser = p.chromium.launch(headless=True)
+            env = BenchEnv(p, browser, base_url, scratch_dir)
+            try:
+                for name in names:
+                    print(f"Running benchmark: {name}", flush=True)
+                    if warmup:
+                        BENCHMARKS[name](env, warmup)
+                    samples = BENCHMARKS[name](env, repetitions)
+                    report['results'][name] = summarize_samples(samples) if samples else {'skipped': True}
+            finally:
+                browser.close()
+    finally:
+        if server is not None:
+            server.shutdown()
+    return report
+
+def save_report(report, output_dir='benchmark_results'):
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    short_commit = (report['commit'] or 'unknown')[:8] + ('-dirty' if report['dirty'] else '')
+    path = os.path.join(output_dir, f'{timestamp}_{short_commit}.json')
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+def compare_reports(baseline, candidate, threshold_pct=10.0):
+    """Median change per benchmark; a regression is a slowdown beyond threshold_pct"""
+    rows = []
+    for name, result in candidate['results'].items():
+        base = baseline['results'].get(name)
+        if not base or base.get('skipped') or result.get('skipped'):
+            continue
+        change_pct = (result['median'] - base['median']) / base['median'] * 100 if base['median'] else 0.0
+        rows.append({
+            'benchmark': name,
+            'baseline_median': base['median'],
+            'candidate_median': result['median'],
+            'change_pct': round(change_pct, 2),
+            'regression': change_pct > threshold_pct,
+        })
+    return rows
+
+def print_comparison(rows, baseline, candidate):
+    print(f"Baseline:  {baseline.get('commit')} ({baseline.get('timestamp')})")
+    print(f"Candidate: {candidate.get('commit')} ({candidate.get('timestamp')})")
+    print(f"{'benchmark':<28}{'baseline ms':>14}{'candidate ms':>14}{'change':>10}")
+    for row in rows:
+        flag = '  REGRESSION' if row['regression'] else ''
+        print(f"{row['benchmark']:<28}{row['baseline_median']:>14.4f}{row['candidate_median']:>14.4f}"
+              f"{row['change_pct']:>9.1f}%{flag}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the automation framework against a local stand-in app")
+    parser.add_argument('--only', help=f"Comma-separated benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument('--repetitions', type=int, default=5)
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--base-url', help="Benchmark against this app instead of starting the stand-in")
+    parser.add_argument('--output-dir', default='benchmark_results')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CANDIDATE'), help="Compare two saved result files instead of running")
+    parser.add_argument('--threshold', type=float, default=10.0, help="Median slowdown (%%) reported as a regression")
+    args = parser.parse_args()
+
+    # The suites log every step at INFO; keep benchmark output to progress lines
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            candidate = json.load(f)
+        rows = compare_reports(baseline, candidate, args.threshold)
+        print_comparison(rows, baseline, candidate)
+        exit(1 if any(row['regression'] for row in rows) else 0)
+
+    names = [name.strip() for name in args.only.split(',')] if args.only else None
+    report = run_benchmarks(names, args.repetitions, args.warmup, args.base_url)
+    path = save_report(report, args.output_dir)
+    for name, result in report['results'].items():
+        if result.get('skipped'):
+            print(f"{name:<28}skipped")
+        else:
+            print(f"{name:<28}median {result['median']:.4f}ms  p95 {result['p95']:.4f}ms")
+    print(f"Results written to {path}")
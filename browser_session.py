@@ -0,0 +1,22 @@
+from contextlib import contextmanager
+from playwright.sync_api import sync_playwright
+from tracing import span
+
+@contextmanager
+def ensure_browser(browser=None, headless=False):
+    """Yield the given warm browser as-is, or launch (and afterwards close) a fresh one"""
+    if browser is not None:
+        yield browser
+        return
+
+    with sync_playwright() as p:
+        with span("launch_browser"):
+            launched = p.chromium.launch(headless=headless)
+        try:
+            yield launched
+        finally:
+            launched.close()
+
+def no_cache_key(context, parameters):
+    """Prefect cache_key_fn for tasks taking a warm browser: never cache, so the unpicklable Browser isn't hashed"""
+    return None
@@ -0,0 +1,159 @@
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from playwright.sync_api import sync_playwright
+from tracing import export_trace, reset_trace
+import suite_runner
+import automation_workflow
+
+SUITES = suite_runner.TEST_SUITES + ('product_search',)
+
+class SmokeDaemon:
+    """Keeps Python, Prefect and one Chromium instance warm and runs suites on a schedule or on trigger.
+
+    Playwright's sync objects belong to the thread that created them, so the browser and every run
+    live on the thread that calls serve_forever(); the HTTP trigger only enqueues requests.
+    """
+
+    def __init__(self, suites, interval_minutes=None, port=None, headless=True, run_on_start=True):
+        self.suites = validate_suites(suites)
+        self.interval_seconds = interval_minutes * 60 if interval_minutes else None
+        self.port = port
+        self.headless = headless
+        self.run_on_start = run_on_start
+        self.requests = queue.Queue()
+        self.history = deque(maxlen=50)
+        self.running = None
+        self.browser = None
+        self._stopping = threading.Event()
+
+    def trigger(self, suites=None, source='manual'):
+        """Queue a run; safe to call from any thread"""
+        suites = validate_suites(suites) if suites else self.suites
+        self.requests.put((suites, source))
+        return suites
+
+    def stop(self):
+        self._stopping.set()
+        self.requests.put(None)
+
+    def status(self):
+        return {
+            'suites': list(self.suites),
+            'interval_seconds': self.interval_seconds,
+            'browser_connected': bool(self.browser and self.browser.is_connected()),
+            'running': self.running,
+            'queued': self.requests.qsize(),
+            'history': list(self.history),
+        }
+
+    def _ensure_browser(self, playwright):
+        if self.browser is None or not self.browser.is_connected():
+            logging.info("Launching warm browser")
+            self.browser = playwright.chromium.launch(headless=self.headless)
+
+    def _run(self, playwright, suites, source):
+        self._ensure_browser(playwright)
+        self.running = {'suites': list(suites), 'source': source, 'started_at': datetime.now().isoformat()}
+        logging.info(f"Starting {source} run: {', '.join(suites)}")
+        start = time.perf_counter()
+        error = None
+        success = True
+        try:
+            runner_suites = [suite for suite in suites if suite in suite_runner.TEST_SUITES]
+            if runner_suites:
+                success = suite_runner.run_tests(browser=self.browser, suites=runner_suites) and success
+            if 'product_search' in suites:
+                automation_workflow.product_search_workflow(browser=self.browser)
+        except Exception as e:
+            success = False
+            error = str(e)
+            logging.error(f"{source} run failed: {error}")
+        finally:
+            export_trace()
+            reset_trace()
+
+        result = {**self.running, 'duration_s': round(time.perf_counter() - start, 2), 'success': success, 'error': error}
+        self.history.append(result)
+        self.running = None
+        logging.info(f"Finished {source} run in {result['duration_s']}s: {'success' if success else 'failed'}")
+
+    def serve_forever(self):
+        server = start_trigger_server(self, self.port) if self.port else None
+        next_scheduled = time.monotonic() if self.run_on_start else self._next_after(time.monotonic())
+
+        try:
+            with sync_playwright() as p:
+                self._ensure_browser(p)
+                while not self._stopping.is_set():
+                    timeout = None
+                    if next_scheduled is not None:
+                        timeout = max(next_scheduled - time.monotonic(), 0)
+                    try:
+                        request = self.requests.get(timeout=timeout)
+                    except queue.Empty:
+                        request = (self.suites, 'scheduled')
+                        next_scheduled = self._next_after(time.monotonic())
+                    if request is None:
+                        break
+                    self._run(p, *request)
+                if self.browser is not None and self.browser.is_connected():
+                    self.browser.close()
+        except KeyboardInterrupt:
+            logging.info("Daemon interrupted, shutting down")
+        finally:
+            if server is not None:
+                server.shutdown()
+
+    def _next_after(self, now):
+        return now + self.interval_seconds if self.interval_seconds else None
+
+def validate_suites(suites):
+    unknown = [suite for suite in suites if suite not in SUITES]
+    if unknown:
+        raise ValueError(f"Unknown suites {unknown}; expected any of {list(SUITES)}")
+    return tuple(suites)
+
+def start_trigger_server(daemon, port):
+    """Serve `POST /run` (optional JSON body {"suites": [...]}) and `GET /status` on localhost"""
+
+    class TriggerHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/status':
+                self._send_json(200, daemon.status())
+            else:
+                self._send_json(404, {'error': 'not found'})
+
+        def do_POST(self):
+            if self.path != '/run':
+                self._send_json(404, {'error': 'not found'})
+                return
+            try:
+                length = int(self.headers.get('Content-Length') or 0)
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                suites = daemon.trigger(payload.get('suites'), source='triggered')
+            except (ValueError, AttributeError) as e:
+                self._send_json(400, {'error': str(e)})
+                return
+            self._send_json(202, {'queued': list(suites)})
+
+        def log_message(self, format, *args):
+            logging.info(f"Trigger server: {format % args}")
+
+    server = ThreadingHTTPServer(('127.0.0.1', port), TriggerHandler)
+    threading.Thread(target=server.serve_forever, name='trigger-server', daemon=True).start()
+    logging.info(f"Trigger server listening on http://127.0.0.1:{port} (POST /run, GET /status)")
+    return server
@@ -0,0 +1,219 @@
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from datetime import datetime
+from playwright.sync_api import sync_playwright
+from models.load_test import LoadTestConfig
+from settings import BASE_URL
+import test_cart
+
+def load_config(config_path='test_data/load_test_config.json'):
+    """Load and validate the load test configuration"""
+    with open(config_path, 'r') as f:
+        config_data = json.load(f)
+    return LoadTestConfig(**config_data)
+
+class LoadStats:
+    """Thread-safe collector of per-step latencies and errors"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.errors = {}
+        self.iterations = 0
+        self.failed_iterations = 0
+
+    def record(self, step, latency_ms, error=None):
+        with self.lock:
+            self.latencies.setdefault(step, []).append(latency_ms)
+            if error is not None:
+                self.errors.setdefault(step, []).append(error)
+
+    def record_iteration(self, failed):
+        with self.lock:
+            self.iterations += 1
+            if failed:
+                self.failed_iterations += 1
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+def summarize(stats, elapsed_seconds):
+    """Build the throughput / latency / error summary for a finished run"""
+    steps = {}
+    for step, values in stats.latencies.items():
+        ordered = sorted(values)
+        error_count = len(stats.errors.get(step, []))
+        steps[step] = {
+            'count': len(ordered),
+            'throughput_per_s': round(len(ordered) / elapsed_seconds, 3),
+            'min_ms': round(ordered[0], 2),
+            'mean_ms': round(sum(ordered) / len(ordered), 2),
+            'p50_ms': round(percentile(ordered, 50), 2),
+            'p90_ms': round(percentile(ordered, 90), 2),
+            'p95_ms': round(percentile(ordered, 95), 2),
+            'p99_ms': round(percentile(ordered, 99), 2),
+            'max_ms': round(ordered[-1], 2),
+            'errors': error_count,
+            'error_rate': round(error_count / len(ordered), 4),
+            'sample_errors': stats.errors.get(step, [])[:5],
+        }
+
+    return {
+        'elapsed_seconds': round(elapsed_seconds, 2),
+        'iterations': stats.iterations,
+        'failed_iterations': stats.failed_iterations,
+        'iterations_per_s': round(stats.iterations / elapsed_seconds, 3),
+        'iteration_error_rate': round(stats.failed_iterations / stats.iterations, 4) if stats.iterations else 0,
+        'steps': steps,
+    }
+
+def think(config):
+    """Pause between steps like a real user would"""
+    delay = config.think_time_seconds
+    if config.think_time_jitter_seconds:
+        delay += random.uniform(-config.think_time_jitter_seconds, config.think_time_jitter_seconds)
+    if delay > 0:
+        time.sleep(delay)
+
+def timed_step(stats, step, func, *args, **kwargs):
+    """Run one journey step, recording its latency and any error"""
+    start = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        stats.record(step, (time.perf_counter() - start) * 1000, error=f"{type(e).__name__}: {e}")
+        raise
+    stats.record(step, (time.perf_counter() - start) * 1000)
+    return result
+
+def open_cart(page):
+    page.click('.shopping_cart_link')
+    page.wait_for_load_state('networkidle')
+
+def verify_logged_in(page):
+    assert '/inventory.html' in page.url, "Failed to reach inventory page"
+
+def run_login_journey(page, config, base_url, stats):
+    """Log in and confirm the inventory page loaded"""
+    timed_step(stats, 'login', test_cart.login, page, config.username, config.password, base_url)
+    verify_logged_in(page)
+
+def run_checkout_journey(page, config, base_url, stats):
+    """Log in, fill the cart, and complete a checkout"""
+    items = [item.model_dump() for item in config.items]
+    checkout_case = {
+        'name': 'load_test_checkout',
+        'expected_result': 'success',
+        'checkout_info': config.checkout_info.model_dump(),
+    }
+
+    timed_step(stats, 'login', test_cart.login, page, config.username, config.password, base_url)
+    verify_logged_in(page)
+    think(config)
+    total_price = timed_step(stats, 'add_items_to_cart', test_cart.add_items_to_cart, page, items)
+    think(config)
+    timed_step(stats, 'open_cart', open_cart, page)
+    timed_step(stats, 'verify_cart', test_cart.verify_cart, page, len(items), total_price, items)
+    think(config)
+    timed_step(stats, 'perform_checkout', test_cart.perform_checkout, page, checkout_case, total_price)
+
+JOURNEYS = {
+    'login': run_login_journey,
+    'checkout': run_checkout_journey,
+}
+
+def run_virtual_user(user_id, config, base_url, stats, start_delay, deadline):
+    """Loop journeys until the deadline; each VU owns its own Playwright and browser"""
+    time.sleep(start_delay)
+    logging.info(f"Virtual user {user_id} started")
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=config.headless)
+        try:
+            while time.monotonic() < deadline:
+                journey = random.choice(config.journeys)
+                # Fresh context per iteration so every journey starts logged out with an empty cart
+                context = browser.new_context()
+                page = context.new_page()
+                failed = False
+                try:
+                    timed_step(stats, f'journey:{journey}', JOURNEYS[journey], page, config, base_url, stats)
+                except Exception as e:
+                    failed = True
+                    logging.warning(f"Virtual user {user_id} {journey} journey failed: {str(e)}")
+                finally:
+                    context.close()
+                stats.record_iteration(failed)
+                think(config)
+        finally:
+            browser.close()
+
+    logging.info(f"Virtual user {user_id} finished")
+
+def run_load_test(config):
+    """Drive the configured number of virtual users and return the summary"""
+    base_url = (config.base_url or BASE_URL).rstrip('/')
+    logging.info(f"Starting load test against {base_url} with {config.virtual_users} virtual users "
+                 f"for {config.duration_seconds}s (ramp-up {config.ramp_up_seconds}s)")
+
+    stats = LoadStats()
+    start = time.monotonic()
+    deadline = start + config.duration_seconds
+    ramp_step = config.ramp_up_seconds / config.virtual_users
+
+    threads = []
+    for user_id in range(config.virtual_users):
+        thread = threading.Thread(
+            target=run_virtual_user,
+            args=(user_id, config, base_url, stats, user_id * ramp_step, deadline),
+            name=f"vu-{user_id}",
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+
+    for thread in threads:
+        thread.join()
+
+    summary = summarize(stats, time.monotonic() - start)
+    summary['base_url'] = base_url
+    summary['virtual_users'] = config.virtual_users
+    return summary
+
+def log_summary(summary):
+    logging.info("=== Load Test Summary ===")
+    logging.info(f"Iterations: {summary['iterations']} ({summary['iterations_per_s']}/s), "
+                 f"error rate: {summary['iteration_error_rate']:.2%}")
+    for step, s in summary['steps'].items():
+        logging.info(f"{step}: n={s['count']} p50={s['p50_ms']}ms p90={s['p90_ms']}ms "
+                     f"p95={s['p95_ms']}ms p99={s['p99_ms']}ms errors={s['error_rate']:.2%}")
+
+def save_summary(summary, output_dir='logs'):
+    """Write the summary as JSON and return its path"""
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    path = os.path.join(output_dir, f'load_test_{timestamp}.json')
+    with open(path, 'w') as f:
+        json.dump(summary, f, indent=2)
+    logging.info(f"Load test results written: {path}")
+    return path
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Drive concurrent virtual users through the login and checkout flows")
+    parser.add_argument('--config', default='test_data/load_test_config.json', help="Path to the load test config JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(threadName)s - %(levelname)s - %(message)s')
+    summary = run_load_test(load_config(args.config))
+    log_summary(summary)
+    save_summary(summary)
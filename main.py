@@ -1,13 +1,12 @@
+import argparse
 import unittest
 import logging
 import os
 from datetime import datetime
-import test_login
-import test_product_data
-import test_cart
-import traceback
-from prefect import flow, task, get_run_logger
+from prefect import task, get_run_logger
 from prefect.logging import get_logger
+from tracing import export_trace
+from suite_runner import TEST_SUITES, run_tests
 
 def setup_logging():
     """Set up logging configuration for the test suite"""
@@ -57,73 +56,36 @@ def initialize_test_run():
     logger.info("Test run environment initialized")
     return True
 
-@task(retries=2, retry_delay_seconds=5)
-def run_login_tests():
-    """Run login test suite"""
-    logger = get_run_logger()
-    logger.info("\n=== Running Login Tests ===")
-    test_login.run_all_tests()
-    return True
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the Sauce Demo test suites")
+    parser.add_argument('--serve', action='store_true', help="Stay running with a warm browser and run suites on a schedule or trigger")
+    parser.add_argument('--suites', default=','.join(TEST_SUITES), help="Comma-separated suites to run (login, product_data, cart; plus product_search when serving)")
+    parser.add_argument('--interval-minutes', type=float, help="With --serve, run the suites every N minutes")
+    parser.add_argument('--port', type=int, help="With --serve, accept POST /run triggers on this localhost port")
+    parser.add_argument('--headed', action='store_true', help="With --serve, show the warm browser window")
+    args = parser.parse_args()
+    suites = [suite.strip() for suite in args.suites.split(',') if suite.strip()]
+    if args.serve:
+        from daemon import SUITES as available_suites
+    else:
+        available_suites = TEST_SUITES
+    unknown_suites = [suite for suite in suites if suite not in available_suites]
+    if unknown_suites:
+        hint = " (product_search is only available with --serve)" if 'product_search' in unknown_suites else ""
+        parser.error(f"unknown suites {', '.join(unknown_suites)}; expected any of {', '.join(available_suites)}{hint}")
+    if args.serve and not args.interval_minutes and not args.port:
+        parser.error("--serve needs --interval-minutes and/or --port")
 
-@task(retries=2, retry_delay_seconds=5)
-def run_product_data_tests():
-    """Run product data test suite"""
-    logger = get_run_logger()
-    logger.info("\n=== Running Product Data Tests ===")
-    test_product_data.run_all_tests()
-    return True
+    initialize_test_run()
 
-@task(retries=2, retry_delay_seconds=5)
-def run_cart_tests():
-    """Run cart test suite"""
-    logger = get_run_logger()
-    logger.info("\n=== Running Cart Tests ===")
-    test_cart.run_all_tests()
-    return True
+    if args.serve:
+        from daemon import SmokeDaemon
+        SmokeDaemon(suites, args.interval_minutes, args.port, headless=not args.headed).serve_forever()
+        exit(0)
 
-@flow(name="Sauce Demo Test Suite")
-def run_tests():
-    """Run all test suites in sequence"""
-    logger = get_run_logger()
-    logger.info("Starting test suite execution")
-    failures = []
-    
-    try:
-        # Run login tests
-        run_login_tests()
-    except Exception as e:
-        logger.error(f"Login tests failed: {str(e)}")
-        failures.append(("Login Tests", str(e), traceback.format_exc()))
-    
-    try:
-        # Run product data tests
-        run_product_data_tests()
-    except Exception as e:
-        logger.error(f"Product data tests failed: {str(e)}")
-        failures.append(("Product Data Tests", str(e), traceback.format_exc()))
-    
     try:
-        # Run cart tests
-        run_cart_tests()
-    except Exception as e:
-        logger.error(f"Cart tests failed: {str(e)}")
-        failures.append(("Cart Tests", str(e), traceback.format_exc()))
-    
-    # Log summary
-    logger.info("\n=== Test Run Summary ===")
-    if failures:
-        logger.error(f"Test suite completed with {len(failures)} failures:")
-        for suite_name, error, stack_trace in failures:
-            logger.error(f"\n{suite_name} failed:")
-            logger.error(f"Error: {error}")
-            logger.error(f"Stack trace:\n{stack_trace}")
-        return False
-    else:
-        logger.info("All test suites completed successfully")
-        return True
-
-if __name__ == '__main__':
-    initialize_test_run()
-    success = run_tests()
+        success = run_tests(suites=suites)
+    finally:
+        export_trace()
     logging.info(f"Test suite execution {'completed successfully' if success else 'failed'}")
     exit(0 if success else 1) 
\ No newline at end of file
@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field, validator
+from typing import List, Literal, Optional
+
+class CartItem(BaseModel):
+    name: str = Field(min_length=1, description="Product name to add to the cart")
+    expected_price: float = Field(ge=0, description="Expected product price")
+
+class CheckoutInfo(BaseModel):
+    first_name: str = Field(default="John", description="Checkout first name")
+    last_name: str = Field(default="Doe", description="Checkout last name")
+    postal_code: str = Field(default="12345", description="Checkout postal code")
+
+class JourneyConfig(BaseModel):
+    base_url: Optional[str] = Field(default=None, description="App URL; defaults to SAUCEDEMO_BASE_URL")
+    think_time_seconds: float = Field(ge=0, description="Pause between steps of a journey")
+    think_time_jitter_seconds: float = Field(default=0, ge=0, description="Random +/- variation on think time")
+    journeys: List[Literal['login', 'checkout']] = Field(min_length=1, description="Journeys picked at random per iteration")
+    username: str = Field(default="standard_user", min_length=1)
+    password: str = Field(default="secret_sauce", min_length=1)
+    items: List[CartItem] = Field(default_factory=list, description="Items added during the checkout journey")
+    checkout_info: CheckoutInfo = Field(default_factory=CheckoutInfo)
+    headless: bool = True
+
+    @validator('items', always=True)
+    def checkout_needs_items(cls, v, values):
+        if 'checkout' in values.get('journeys', []) and not v:
+            raise ValueError('items must not be empty when the checkout journey is enabled')
+        return v
+
+class LoadTestConfig(JourneyConfig):
+    virtual_users: int = Field(ge=1, description="Number of concurrent virtual users")
+    ramp_up_seconds: float = Field(ge=0, description="Time over which virtual users are started")
+    duration_seconds: float = Field(gt=0, description="Total run time, including ramp-up")
+
+    @validator('duration_seconds')
+    def duration_must_exceed_ramp_up(cls, v, values):
+        if 'ramp_up_seconds' in values and v <= values['ramp_up_seconds']:
+            raise ValueError('duration_seconds must be longer than ramp_up_seconds')
+        return v
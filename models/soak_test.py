@@ -0,0 +1,12 @@
+from pydantic import Field
+from typing import Optional
+from models.load_test import JourneyConfig
+
+class SoakTestConfig(JourneyConfig):
+    duration_minutes: float = Field(gt=0, description="How long to keep running journeys")
+    max_iterations: Optional[int] = Field(default=None, ge=1, description="Stop early after this many iterations")
+    recycle_context_every: Optional[int] = Field(default=None, ge=1, description="Recreate the browser context after this many iterations")
+    recycle_context_heap_mb: Optional[float] = Field(default=None, gt=0, description="Recreate the context once the JS heap reaches this size")
+    recycle_browser_every: Optional[int] = Field(default=None, ge=1, description="Relaunch the browser after this many iterations")
+    recycle_browser_rss_mb: Optional[float] = Field(default=None, gt=0, description="Relaunch the browser once its processes' combined RSS reaches this size")
+    trend_windows: int = Field(default=10, ge=1, description="Number of time windows the trend report is split into")
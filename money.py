@@ -0,0 +1,39 @@
+import re
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Sales tax the app applies on checkout-step-two
+TAX_RATE = Decimal('0.08')
+
+_AMOUNT_PATTERN = re.compile(r'-?\d[\d,]*(?:\.\d+)?')
+
+def _round_to_cents(amount):
+    return int((amount * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+def parse_cents(text):
+    """Parse the amount out of price text such as "$29.99" or "Item total: $39.98" into integer cents"""
+    match = _AMOUNT_PATTERN.search(text or '')
+    if not match:
+        raise ValueError(f"No price found in {text!r}")
+    try:
+        return _round_to_cents(Decimal(match.group().replace(',', '')))
+    except InvalidOperation:
+        raise ValueError(f"Invalid price in {text!r}")
+
+def to_cents(value):
+    """Convert an expected price (str, int, float or Decimal) to integer cents"""
+    if isinstance(value, str):
+        return parse_cents(value)
+    if isinstance(value, float):
+        # repr() is the shortest string that round-trips, so 29.99 becomes Decimal('29.99') exactly
+        value = Decimal(repr(value))
+    return _round_to_cents(Decimal(value))
+
+def format_cents(cents):
+    """Render integer cents the way the app does, e.g. 2999 -> "$29.99\""""
+    sign = '-' if cents < 0 else ''
+    cents = abs(cents)
+    return f"{sign}${cents // 100}.{cents % 100:02d}"
+
+def expected_tax_cents(subtotal_cents, rate=TAX_RATE):
+    """Tax on a subtotal, rounded half up to the cent"""
+    return int((Decimal(subtotal_cents) * rate).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
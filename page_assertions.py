@@ -0,0 +1,148 @@
+import logging
+from tracing import traced
+
+# Named checks that `additional_validations` in the test data can switch on.
+# A JSON value of `true` uses the spec as-is; an object overrides individual fields,
+# e.g. {"check_inventory_count": {"op": "eq", "value": 6}}. Keys not listed here can
+# still be used by giving a full spec with at least "selector" and "kind".
+VALIDATION_SPECS = {
+    'check_inventory_count': {
+        'selector': '.inventory_item',
+        'kind': 'count',
+        'op': 'gt',
+        'value': 0,
+        'message': "Inventory should contain items",
+    },
+    'check_cart_empty': {
+        'selector': '.shopping_cart_badge',
+        'kind': 'hidden',
+        'message': "Cart should be empty",
+    },
+    'check_menu_visible': {
+        'selector': '#react-burger-menu-btn',
+        'kind': 'visible',
+        'message': "Menu button should be visible",
+    },
+    'check_nonexistent_element': {
+        'selector': '#this-element-does-not-exist',
+        'kind': 'hidden',
+        'message': "This element should not be visible as it doesn't exist",
+    },
+}
+
+SUPPORTED_KINDS = ('count', 'visible', 'hidden', 'text_contains')
+SUPPORTED_OPS = ('eq', 'ne', 'gt', 'ge', 'lt', 'le')
+
+# Evaluates every spec in a single round trip and returns one result per spec
+_EVALUATE_SCRIPT = """
+(specs) => {
+    const isVisible = (el) => {
+        if (!el) return false;
+        const style = window.getComputedStyle(el);
+        if (style.visibility === 'hidden' || style.display === 'none') return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+    const compare = (actual, op, expected) => {
+        switch (op) {
+            case 'eq': return actual === expected;
+            case 'ne': return actual !== expected;
+            case 'gt': return actual > expected;
+            case 'ge': return actual >= expected;
+            case 'lt': return actual < expected;
+            case 'le': return actual <= expected;
+        }
+        return false;
+    };
+    return specs.map((spec) => {
+        try {
+            switch (spec.kind) {
+                case 'count': {
+                    const actual = document.querySelectorAll(spec.selector).length;
+                    return { passed: compare(actual, spec.op, spec.value), actual };
+                }
+                case 'visible': {
+                    const actual = isVisible(document.querySelector(spec.selector));
+                    return { passed: actual, actual };
+                }
+                case 'hidden': {
+                    const actual = isVisible(document.querySelector(spec.selector));
+                    return { passed: !actual, actual };
+                }
+                case 'text_contains': {
+                    const el = document.querySelector(spec.selector);
+                    const actual = el ? el.textContent : null;
+                    return { passed: actual !== null && actual.includes(spec.value), actual };
+                }
+            }
+            return { passed: false, actual: null, error: `Unsupported kind: ${spec.kind}` };
+        } catch (e) {
+            return { passed: false, actual: null, error: String(e) };
+        }
+    });
+}
+"""
+
+def build_assertion_specs(validations):
+    """Turn an `additional_validations` mapping into a list of assertion specs"""
+    specs = []
+    for name, value in validations.items():
+        if value is False or value is None:
+            continue
+
+        spec = dict(VALIDATION_SPECS.get(name, {}))
+        if isinstance(value, dict):
+            spec.update(value)
+        elif value is not True:
+            raise ValueError(f"Validation '{name}' must be true, false or an object, got {value!r}")
+
+        if 'selector' not in spec or 'kind' not in spec:
+            raise ValueError(f"Unknown validation '{name}': custom validations need 'selector' and 'kind'")
+        if spec['kind'] not in SUPPORTED_KINDS:
+            raise ValueError(f"Validation '{name}' has unsupported kind '{spec['kind']}'")
+        if spec['kind'] == 'count' and spec.get('op') not in SUPPORTED_OPS:
+            raise ValueError(f"Validation '{name}' needs an 'op' from {SUPPORTED_OPS}")
+
+        spec['name'] = name
+        spec.setdefault('message', f"Validation '{name}' failed")
+        specs.append(spec)
+    return specs
+
+@traced("evaluate_assertions")
+def evaluate_assertions(page, specs):
+    """Run all specs in one in-page evaluation and return a pass/fail result per spec"""
+    if not specs:
+        return []
+
+    payload = [
+        {'selector': s['selector'], 'kind': s['kind'], 'op': s.get('op'), 'value': s.get('value')}
+        for s in specs
+    ]
+    raw_results = page.evaluate(_EVALUATE_SCRIPT, payload)
+
+    results = []
+    for spec, raw in zip(specs, raw_results):
+        result = {
+            'name': spec['name'],
+            'passed': raw['passed'],
+            'actual': raw['actual'],
+            'message': spec['message'],
+        }
+        if raw.get('error'):
+            result['error'] = raw['error']
+        results.append(result)
+    return results
+
+def assert_all_passed(results):
+    """Log each result and raise one AssertionError listing every failed check"""
+    failures = []
+    for result in results:
+        if result['passed']:
+            logging.info(f"Verified {result['name']} (actual: {result['actual']})")
+        else:
+            detail = result.get('error') or f"actual: {result['actual']}"
+            logging.error(f"Validation failed: {result['name']} ({detail})")
+            failures.append(f"{result['message']} ({detail})")
+
+    if failures:
+        raise AssertionError("; ".join(failures))
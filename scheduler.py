@@ -0,0 +1,71 @@
+import logging
+import threading
+
+def group_cases_by_user(test_cases):
+    """Group test cases by (username, password), keeping first-seen order within and across groups"""
+    groups = {}
+    for test_case in test_cases:
+        key = (test_case['username'], test_case['password'])
+        groups.setdefault(key, []).append(test_case)
+    return [
+        {'username': username, 'password': password, 'cases': cases}
+        for (username, password), cases in groups.items()
+    ]
+
+def assign_groups_to_workers(groups, workers):
+    """Spread user groups over workers, largest group first onto the least loaded worker"""
+    workers = max(1, min(workers, len(groups))) if groups else 1
+    assignments = [[] for _ in range(workers)]
+    loads = [0] * workers
+    for group in sorted(groups, key=lambda g: len(g['cases']), reverse=True):
+        target = loads.index(min(loads))
+        assignments[target].append(group)
+        loads[target] += len(group['cases'])
+    return assignments
+
+class LoginCounter:
+    """Thread-safe tally of logins performed versus cases run"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.logins = 0
+        self.cases = 0
+
+    def add(self, logins=0, cases=0):
+        with self.lock:
+            self.logins += logins
+            self.cases += cases
+
+    @property
+    def logins_avoided(self):
+        return self.cases - self.logins
+
+    def log_summary(self, suite_name):
+        logging.info(f"{suite_name}: ran {self.cases} cases with {self.logins} logins "
+                     f"({self.logins_avoided} logins avoided)")
+
+def run_worker_assignments(assignments, worker_func):
+    """Run worker_func(worker_id, groups) for each assignment, in threads when there is more than one"""
+    if len(assignments) == 1:
+        worker_func(0, assignments[0])
+        return
+
+    errors = []
+
+    def target(worker_id, groups):
+        try:
+            worker_func(worker_id, groups)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=target, args=(worker_id, groups), name=f"worker-{worker_id}")
+        for worker_id, groups in enumerate(assignments)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    if errors:
+        raise errors[0]
@@ -0,0 +1,11 @@
+import os
+from dotenv import load_dotenv
+
+# Pick up overrides from a local .env file if one exists
+load_dotenv()
+
+# Root URL of the app under test; point at staging or a local stand-in via SAUCEDEMO_BASE_URL
+BASE_URL = os.environ.get('SAUCEDEMO_BASE_URL', 'https://www.saucedemo.com').rstrip('/')
+
+# Number of parallel workers the cart suite spreads its per-user groups over
+TEST_WORKERS = int(os.environ.get('TEST_WORKERS', '1'))
@@ -0,0 +1,258 @@
+import argparse
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime
+import psutil
+from playwright.sync_api import sync_playwright
+from models.soak_test import SoakTestConfig
+from settings import BASE_URL
+from load_test import JOURNEYS, LoadStats, percentile, think, timed_step
+
+BROWSER_PROCESS_NAMES = ('chrom', 'headless_shell')
+
+def load_config(config_path='test_data/soak_test_config.json'):
+    """Load and validate the soak test configuration"""
+    with open(config_path, 'r') as f:
+        config_data = json.load(f)
+    return SoakTestConfig(**config_data)
+
+def sample_browser_memory():
+    """Sum RSS (MB) of the Chromium processes started by this run, split by process type"""
+    memory = {'browser_mb': 0.0, 'renderer_mb': 0.0, 'other_mb': 0.0, 'renderer_count': 0}
+    for proc in psutil.Process().children(recursive=True):
+        try:
+            if not any(name in proc.name().lower() for name in BROWSER_PROCESS_NAMES):
+                continue
+            rss_mb = proc.memory_info().rss / (1024 * 1024)
+            cmdline = ' '.join(proc.cmdline())
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+
+        if '--type=renderer' in cmdline:
+            memory['renderer_mb'] += rss_mb
+            memory['renderer_count'] += 1
+        elif '--type=' in cmdline:
+            memory['other_mb'] += rss_mb
+        else:
+            memory['browser_mb'] += rss_mb
+
+    memory['total_mb'] = memory['browser_mb'] + memory['renderer_mb'] + memory['other_mb']
+    return {key: round(value, 2) for key, value in memory.items()}
+
+def sample_js_heap(cdp_session):
+    """Read the page's JS heap size (MB) over the DevTools protocol"""
+    metrics = cdp_session.send('Performance.getMetrics')['metrics']
+    values = {metric['name']: metric['value'] for metric in metrics}
+    return {
+        'js_heap_used_mb': round(values.get('JSHeapUsedSize', 0) / (1024 * 1024), 2),
+        'js_heap_total_mb': round(values.get('JSHeapTotalSize', 0) / (1024 * 1024), 2),
+    }
+
+class SoakSession:
+    """Owns the browser, context and page reused across iterations, and recycles them on demand"""
+
+    def __init__(self, playwright, config):
+        self.playwright = playwright
+        self.config = config
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.cdp_session = None
+        self.context_iterations = 0
+        self.browser_iterations = 0
+
+    def launch_browser(self):
+        self.browser = self.playwright.chromium.launch(headless=self.config.headless)
+        self.browser_iterations = 0
+        self.new_context()
+
+    def new_context(self):
+        self.context = self.browser.new_context()
+        self.page = self.context.new_page()
+        self.cdp_session = self.context.new_cdp_session(self.page)
+        self.cdp_session.send('Performance.enable')
+        self.context_iterations = 0
+
+    def recycle_context(self):
+        self.context.close()
+        self.new_context()
+
+    def recycle_browser(self):
+        self.browser.close()
+        self.launch_browser()
+
+    def close(self):
+        if self.browser is not None:
+            self.browser.close()
+
+    def recycle_if_needed(self, sample):
+        """Apply the configured thresholds; returns what was recycled, if anything"""
+        config = self.config
+        if ((config.recycle_browser_every and self.browser_iterations >= config.recycle_browser_every)
+                or (config.recycle_browser_rss_mb and sample['memory']['total_mb'] >= config.recycle_browser_rss_mb)):
+            self.recycle_browser()
+            return 'browser'
+        heap_mb = sample['js_heap_used_mb']
+        if (heap_mb is None
+                or (config.recycle_context_every and self.context_iterations >= config.recycle_context_every)
+                or (config.recycle_context_heap_mb and heap_mb >= config.recycle_context_heap_mb)):
+            self.recycle_context()
+            return 'context'
+        return None
+
+def run_iteration(session, config, base_url, iteration, started):
+    """Run one random journey on the shared page and return its sample"""
+    journey = random.choice(config.journeys)
+    stats = LoadStats()
+    error = None
+    try:
+        timed_step(stats, 'journey', JOURNEYS[journey], session.page, config, base_url, stats)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        logging.warning(f"Soak iteration {iteration} {journey} journey failed: {error}")
+        # Drop any half-built cart so the next iteration starts clean
+        try:
+            session.page.evaluate("() => localStorage.removeItem('cart-contents')")
+        except Exception:
+            pass
+
+    session.context_iterations += 1
+    session.browser_iterations += 1
+
+    sample = {
+        'iteration': iteration,
+        'timestamp': datetime.now().isoformat(),
+        'elapsed_s': round(time.monotonic() - started, 2),
+        'journey': journey,
+        'steps_ms': {step: round(values[0], 2) for step, values in stats.latencies.items()},
+        'error': error,
+        'memory': sample_browser_memory(),
+    }
+    try:
+        sample.update(sample_js_heap(session.cdp_session))
+    except Exception as e:
+        # A crashed or detached page can't report its heap; recycle_if_needed replaces it
+        logging.warning(f"Could not read JS heap on iteration {iteration}: {str(e)}")
+        sample.update({'js_heap_used_mb': None, 'js_heap_total_mb': None})
+    return sample
+
+def slope_per_hour(points):
+    """Least-squares slope of (elapsed_s, value) points, scaled to units per hour"""
+    if len(points) < 2:
+        return None
+    n = len(points)
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if denominator == 0:
+        return None
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+    return round(slope * 3600, 3)
+
+def summarize_trends(samples, windows):
+    """Split the run into time windows and fit overall growth rates for heap, RSS and latency"""
+    if not samples:
+        return {'iterations': 0, 'windows': [], 'slopes_per_hour': {}}
+
+    total_s = max(samples[-1]['elapsed_s'], 1e-9)
+    buckets = [[] for _ in range(windows)]
+    for sample in samples:
+        index = min(int(sample['elapsed_s'] / total_s * windows), windows - 1)
+        buckets[index].append(sample)
+
+    window_reports = []
+    for index, bucket in enumerate(buckets):
+        if not bucket:
+            continue
+        journey_ms = sorted(s['steps_ms']['journey'] for s in bucket if 'journey' in s['steps_ms'])
+        heaps = [s['js_heap_used_mb'] for s in bucket if s['js_heap_used_mb'] is not None]
+        step_names = {step for s in bucket for step in s['steps_ms']}
+        window_reports.append({
+            'window': index,
+            'start_s': round(bucket[0]['elapsed_s'], 2),
+            'end_s': round(bucket[-1]['elapsed_s'], 2),
+            'iterations': len(bucket),
+            'errors': sum(1 for s in bucket if s['error']),
+            'mean_js_heap_used_mb': round(sum(heaps) / len(heaps), 2) if heaps else None,
+            'mean_browser_total_mb': round(sum(s['memory']['total_mb'] for s in bucket) / len(bucket), 2),
+            'mean_renderer_mb': round(sum(s['memory']['renderer_mb'] for s in bucket) / len(bucket), 2),
+            'journey_p50_ms': percentile(journey_ms, 50),
+            'journey_p95_ms': percentile(journey_ms, 95),
+            'step_p50_ms': {
+                step: percentile(sorted(s['steps_ms'][step] for s in bucket if step in s['steps_ms']), 50)
+                for step in sorted(step_names)
+            },
+        })
+
+    return {
+        'iterations': len(samples),
+        'errors': sum(1 for s in samples if s['error']),
+        'recycles': [
+            {'iteration': s['iteration'], 'elapsed_s': s['elapsed_s'], 'recycled': s['recycled']}
+            for s in samples if s.get('recycled')
+        ],
+        'slopes_per_hour': {
+            'js_heap_used_mb': slope_per_hour([(s['elapsed_s'], s['js_heap_used_mb']) for s in samples if s['js_heap_used_mb'] is not None]),
+            'browser_total_mb': slope_per_hour([(s['elapsed_s'], s['memory']['total_mb']) for s in samples]),
+            'journey_ms': slope_per_hour([(s['elapsed_s'], s['steps_ms']['journey']) for s in samples if 'journey' in s['steps_ms']]),
+        },
+        'windows': window_reports,
+    }
+
+def run_soak_test(config, output_dir='logs'):
+    """Run journeys until the duration or iteration limit is hit, streaming samples to a JSONL file"""
+    base_url = (config.base_url or BASE_URL).rstrip('/')
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    samples_path = os.path.join(output_dir, f'soak_{timestamp}.jsonl')
+    summary_path = os.path.join(output_dir, f'soak_{timestamp}_summary.json')
+
+    logging.info(f"Starting soak test against {base_url} for {config.duration_minutes} minutes; samples: {samples_path}")
+    started = time.monotonic()
+    deadline = started + config.duration_minutes * 60
+    samples = []
+
+    with sync_playwright() as p, open(samples_path, 'w') as samples_file:
+        session = SoakSession(p, config)
+        session.launch_browser()
+        try:
+            iteration = 0
+            while time.monotonic() < deadline and (config.max_iterations is None or iteration < config.max_iterations):
+                sample = run_iteration(session, config, base_url, iteration, started)
+                sample['recycled'] = session.recycle_if_needed(sample)
+                if sample['recycled']:
+                    logging.info(f"Recycled {sample['recycled']} after iteration {iteration} "
+                                 f"(heap {sample['js_heap_used_mb']}MB, browser {sample['memory']['total_mb']}MB)")
+
+                samples.append(sample)
+                samples_file.write(json.dumps(sample) + '\n')
+                samples_file.flush()
+                iteration += 1
+                think(config)
+        except KeyboardInterrupt:
+            logging.info("Soak test interrupted, writing report for the samples collected so far")
+        finally:
+            session.close()
+
+    summary = summarize_trends(samples, config.trend_windows)
+    summary['base_url'] = base_url
+    summary['samples_file'] = samples_path
+    with open(summary_path, 'w') as f:
+        json.dump(summary, f, indent=2)
+
+    logging.info(f"Soak test finished after {summary['iterations']} iterations; "
+                 f"heap slope {summary['slopes_per_hour'].get('js_heap_used_mb')}MB/h, "
+                 f"journey latency slope {summary['slopes_per_hour'].get('journey_ms')}ms/h")
+    logging.info(f"Soak test report written: {summary_path}")
+    return summary
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the login/checkout journeys continuously while monitoring browser memory")
+    parser.add_argument('--config', default='test_data/soak_test_config.json', help="Path to the soak test config JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    run_soak_test(load_config(args.config))
@@ -0,0 +1,178 @@
+// Minimal stand-in for www.saucedemo.com: same selectors, cookie session and
+// localStorage cart ("cart-contents"), so the suites and benchmarks can run offline.
+(function () {
+    const CATALOG = [
+        { id: 4, name: 'Sauce Labs Backpack', price: 29.99, image: 'sauce-backpack.svg',
+          desc: 'carry.allTheThings() with the sleek, streamlined Sly Pack that melds uncompromising style with unequaled laptop and tablet protection.' },
+        { id: 0, name: 'Sauce Labs Bike Light', price: 9.99, image: 'bike-light.svg',
+          desc: "A red light isn't the desired state in testing but it sure helps when riding your bike at night. Water-resistant with 3 lighting modes, 1 AAA battery included." },
+        { id: 1, name: 'Sauce Labs Bolt T-Shirt', price: 15.99, image: 'bolt-shirt.svg',
+          desc: 'Get your testing superhero on with the Sauce Labs bolt T-shirt. From American Apparel, 100% ringspun combed cotton, heather gray with red bolt.' },
+        { id: 5, name: 'Sauce Labs Fleece Jacket', price: 49.99, image: 'sauce-pullover.svg',
+          desc: "It's not every day that you come across a midweight quarter-zip fleece jacket capable of handling everything from a relaxing day outdoors to a busy day at the office." },
+        { id: 2, name: 'Sauce Labs Onesie', price: 7.99, image: 'red-onesie.svg',
+          desc: "Rib snap infant onesie for the junior automation engineer in development. Reinforced 3-snap bottom closure, two-needle hemmed sleeved and bottom won't unravel." },
+        { id: 3, name: 'Test.allTheThings() T-Shirt (Red)', price: 15.99, image: 'red-tatt.svg',
+          desc: 'This classic Sauce Labs t-shirt is perfect to wear when cozying up to your keyboard to automate a few tests. Super-soft and comfy ringspun combed cotton.' },
+    ];
+    const USERS = ['standard_user', 'locked_out_user', 'problem_user', 'performance_glitch_user', 'error_user', 'visual_user'];
+    const PASSWORD = 'secret_sauce';
+    const TAX_RATE = 0.08;
+
+    const byId = (id) => CATALOG.find((item) => item.id === id);
+    const money = (value) => `$${value.toFixed(2)}`;
+    const slug = (name) => name.toLowerCase().replace(/[^a-z0-9]+/g, '-').replace(/(^-|-$)/g, '');
+
+    const getCart = () => JSON.parse(localStorage.getItem('cart-contents') || '[]');
+    const setCart = (ids) => {
+        if (ids.length) localStorage.setItem('cart-contents', JSON.stringify(ids));
+        else localStorage.removeItem('cart-contents');
+        renderBadge();
+    };
+
+    const sessionUser = () => {
+        const match = document.cookie.match(/(?:^|; )session-username=([^;]*)/);
+        return match ? decodeURIComponent(match[1]) : null;
+    };
+
+    const showError = (message) => {
+        document.querySelector('.error-message-container').innerHTML =
+            `<h3 data-test="error">${message}</h3>`;
+    };
+
+    function renderBadge() {
+        const link = document.querySelector('.shopping_cart_link');
+        if (!link) return;
+        const count = getCart().length;
+        link.innerHTML = count ? `<span class="shopping_cart_badge">${count}</span>` : '';
+    }
+
+    function renderCartList(list) {
+        list.innerHTML = getCart().map((id) => {
+            const item = byId(id);
+            return `<div class="cart_item">
+                <div class="cart_quantity">1</div>
+                <a id="item_${item.id}_title_link" href="#"><div class="inventory_item_name">${item.name}</div></a>
+                <div class="inventory_item_desc">${item.desc}</div>
+                <div class="inventory_item_price">${money(item.price)}</div>
+            </div>`;
+        }).join('');
+    }
+
+    const pages = {
+        login() {
+            document.getElementById('login-form').addEventListener('submit', (event) => {
+                event.preventDefault();
+                const username = document.getElementById('user-name').value;
+                const password = document.getElementById('password').value;
+                if (!username) return showError('Epic sadface: Username is required');
+                if (!password) return showError('Epic sadface: Password is required');
+                if (!USERS.includes(username) || password !== PASSWORD) {
+                    return showError('Epic sadface: Username and password do not match any user in this service');
+                }
+                if (username === 'locked_out_user') {
+                    return showError('Epic sadface: Sorry, this user has been locked out.');
+                }
+                document.cookie = `session-username=${encodeURIComponent(username)}; path=/`;
+                window.location.assign('/inventory.html');
+            });
+        },
+
+        inventory() {
+            const list = document.querySelector('.inventory_list');
+            list.innerHTML = CATALOG.map((item) => `<div class="inventory_item">
+                <div class="inventory_item_img"><img class="inventory_item_img" alt="${item.name}" src="/static/media/${item.image}"></div>
+                <div class="inventory_item_label">
+                    <a id="item_${item.id}_title_link" href="#"><div class="inventory_item_name">${item.name}</div></a>
+                    <div class="inventory_item_desc">${item.desc}</div>
+                </div>
+                <div class="pricebar">
+                    <div class="inventory_item_price">${money(item.price)}</div>
+                    <button class="btn btn_inventory" data-item-id="${item.id}" id="add-to-cart-${slug(item.name)}">Add to cart</button>
+                </div>
+            </div>`).join('');
+
+            const syncButtons = () => {
+                const cart = getCart();
+                list.querySelectorAll('.btn_inventory').forEach((button) => {
+                    button.textContent = cart.includes(Number(button.dataset.itemId)) ? 'Remove' : 'Add to cart';
+                });
+            };
+            list.addEventListener('click', (event) => {
+                const button = event.target.closest('.btn_inventory');
+                if (!button) {
+                    // Clicking anywhere else on a product opens its details page
+                    const product = event.target.closest('.inventory_item');
+                    if (product) {
+                        event.preventDefault();
+                        sessionStorage.setItem('selected-item', product.querySelector('.btn_inventory').dataset.itemId);
+                        window.location.assign('/inventory-item.html');
+                    }
+                    return;
+                }
+                const id = Number(button.dataset.itemId);
+                const cart = getCart();
+                setCart(cart.includes(id) ? cart.filter((other) => other !== id) : [...cart, id]);
+                syncButtons();
+            });
+            syncButtons();
+        },
+
+        'inventory-item'() {
+            const item = byId(Number(sessionStorage.getItem('selected-item')));
+            document.querySelector('.inventory_details_name').textContent = item.name;
+            document.querySelector('.inventory_details_desc').textContent = item.desc;
+            document.querySelector('.inventory_details_price').textContent = money(item.price);
+            document.getElementById('back-to-products').addEventListener('click', () => window.location.assign('/inventory.html'));
+        },
+
+        cart() {
+            renderCartList(document.querySelector('.cart_list'));
+            document.getElementById('checkout').addEventListener('click', () => window.location.assign('/checkout-step-one.html'));
+            document.getElementById('continue-shopping').addEventListener('click', () => window.location.assign('/inventory.html'));
+        },
+
+        'checkout-step-one'() {
+            if (sessionUser() === 'problem_user') {
+                // Like saucedemo, problem_user's last name lands in the first-name field
+                const lastName = document.getElementById('last-name');
+                lastName.addEventListener('input', () => {
+                    document.getElementById('first-name').value = lastName.value;
+                    lastName.value = '';
+                });
+            }
+            document.getElementById('checkout-form').addEventListener('submit', (event) => {
+                event.preventDefault();
+                if (!document.getElementById('first-name').value) return showError('Error: First Name is required');
+                if (!document.getElementById('last-name').value) return showError('Error: Last Name is required');
+                if (!document.getElementById('postal-code').value) return showError('Error: Postal Code is required');
+                window.location.assign('/checkout-step-two.html');
+            });
+        },
+
+        'checkout-step-two'() {
+            renderCartList(document.querySelector('.cart_list'));
+            const subtotal = getCart().reduce((sum, id) => sum + byId(id).price, 0);
+            const tax = Math.round(subtotal * TAX_RATE * 100) / 100;
+            document.querySelector('.summary_subtotal_label').textContent = `Item total: ${money(subtotal)}`;
+            document.querySelector('.summary_tax_label').textContent = `Tax: ${money(tax)}`;
+            document.querySelector('.summary_total_label').textContent = `Total: ${money(subtotal + tax)}`;
+            document.getElementById('finish').addEventListener('click', () => {
+                setCart([]);
+                window.location.assign('/checkout-complete.html');
+            });
+        },
+
+        'checkout-complete'() {
+            document.getElementById('back-to-products').addEventListener('click', () => window.location.assign('/inventory.html'));
+        },
+    };
+
+    const page = document.body.dataset.page;
+    if (page !== 'login' && !sessionUser()) {
+        window.location.replace('/');
+        return;
+    }
+    renderBadge();
+    pages[page]();
+})();
@@ -0,0 +1,34 @@
+import argparse
+import functools
+import logging
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+STAND_IN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stand_in_app')
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        logging.debug(f"Stand-in app: {format % args}")
+
+def start_stand_in_server(port=0, host='127.0.0.1'):
+    """Serve the stand-in app in a background thread; returns the server and its base URL"""
+    handler = functools.partial(QuietHandler, directory=STAND_IN_DIR)
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name='stand-in-app', daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}"
+    logging.info(f"Stand-in app serving {STAND_IN_DIR} at {base_url}")
+    return server, base_url
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Serve the local stand-in of saucedemo.com")
+    parser.add_argument('--port', type=int, default=3000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server, base_url = start_stand_in_server(args.port)
+    print(f"Set SAUCEDEMO_BASE_URL={base_url} to point the suites at it (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
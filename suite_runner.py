@@ -0,0 +1,77 @@
+import traceback
+from prefect import flow, task, get_run_logger
+from browser_session import no_cache_key
+import test_login
+import test_product_data
+import test_cart
+
+TEST_SUITES = ('login', 'product_data', 'cart')
+
+@task(retries=2, retry_delay_seconds=5, cache_key_fn=no_cache_key)
+def run_login_tests(browser=None):
+    """Run login test suite"""
+    logger = get_run_logger()
+    logger.info("\n=== Running Login Tests ===")
+    test_login.run_all_tests(browser=browser)
+    return True
+
+@task(retries=2, retry_delay_seconds=5, cache_key_fn=no_cache_key)
+def run_product_data_tests(browser=None):
+    """Run product data test suite"""
+    logger = get_run_logger()
+    logger.info("\n=== Running Product Data Tests ===")
+    test_product_data.run_all_tests(browser=browser)
+    return True
+
+@task(retries=2, retry_delay_seconds=5, cache_key_fn=no_cache_key)
+def run_cart_tests(browser=None):
+    """Run cart test suite"""
+    logger = get_run_logger()
+    logger.info("\n=== Running Cart Tests ===")
+    test_cart.run_all_tests(browser=browser)
+    return True
+
+@flow(name="Sauce Demo Test Suite")
+def run_tests(browser=None, suites=None):
+    """Run the selected test suites (all by default) in sequence"""
+    logger = get_run_logger()
+    logger.info("Starting test suite execution")
+    suites = suites or TEST_SUITES
+    failures = []
+    
+    if 'login' in suites:
+        try:
+            # Run login tests
+            run_login_tests(browser)
+        except Exception as e:
+            logger.error(f"Login tests failed: {str(e)}")
+            failures.append(("Login Tests", str(e), traceback.format_exc()))
+    
+    if 'product_data' in suites:
+        try:
+            # Run product data tests
+            run_product_data_tests(browser)
+        except Exception as e:
+            logger.error(f"Product data tests failed: {str(e)}")
+            failures.append(("Product Data Tests", str(e), traceback.format_exc()))
+    
+    if 'cart' in suites:
+        try:
+            # Run cart tests
+            run_cart_tests(browser)
+        except Exception as e:
+            logger.error(f"Cart tests failed: {str(e)}")
+            failures.append(("Cart Tests", str(e), traceback.format_exc()))
+    
+    # Log summary
+    logger.info("\n=== Test Run Summary ===")
+    if failures:
+        logger.error(f"Test suite completed with {len(failures)} failures:")
+        for suite_name, error, stack_trace in failures:
+            logger.error(f"\n{suite_name} failed:")
+            logger.error(f"Error: {error}")
+            logger.error(f"Stack trace:\n{stack_trace}")
+        return False
+    else:
+        logger.info("All test suites completed successfully")
+        return True
@@ -3,8 +3,13 @@ import logging
 import os
 import time
 from datetime import datetime
-from playwright.sync_api import sync_playwright
 import re
+from playwright.sync_api import expect
+from tracing import span, traced, export_trace
+from settings import BASE_URL, TEST_WORKERS
+from browser_session import ensure_browser
+from money import parse_cents, to_cents, format_cents, expected_tax_cents
+from scheduler import group_cases_by_user, assign_groups_to_workers, run_worker_assignments, LoginCounter
 
 def load_test_cases():
     """Load test cases from JSON file"""
@@ -24,6 +29,7 @@ def log_form_validation_error(test_case_name, error_message):
     with open('logs/validation_errors.log', 'a') as f:
         f.write(log_entry)
 
+@traced("capture_failure_screenshot")
 def capture_failure_screenshot(page, test_name):
     """Capture screenshot on test failure"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -31,80 +37,191 @@ def capture_failure_screenshot(page, test_name):
     page.screenshot(path=screenshot_path)
     logging.info(f"Screenshot captured: {screenshot_path}")
 
+# Collects every inventory price in one round trip, keyed by product name
+_INVENTORY_PRICES_SCRIPT = """
+(items) => Object.fromEntries(items.map((el) => [
+    el.querySelector('.inventory_item_name').textContent.trim(),
+    el.querySelector('.inventory_item_price').textContent,
+]))
+"""
+
+@traced("add_items_to_cart")
 def add_items_to_cart(page, items):
-    """Add items to cart and verify their prices"""
-    total_price = 0
+    """Add items to cart and verify their prices; returns the expected cart total in cents"""
+    inventory_prices = page.locator('.inventory_item').evaluate_all(_INVENTORY_PRICES_SCRIPT)
+    cart_badge = page.locator('.shopping_cart_badge')
+    badge_count = int(next(iter(cart_badge.all_text_contents()), 0))
+    total_cents = 0
+    for item in items:
+        with span(f"add_item[{item['name']}]"):
+            if item['name'] not in inventory_prices:
+                raise AssertionError(f"Item not found: {item['name']}")
+            
+            # Verify price
+            actual_cents = parse_cents(inventory_prices[item['name']])
+            expected_cents = to_cents(item['expected_price'])
+            if actual_cents != expected_cents:
+                error_msg = (f"Price mismatch for {item['name']}: expected {format_cents(expected_cents)}, "
+                             f"got {format_cents(actual_cents)}")
+                logging.error(error_msg)
+                log_form_validation_error("price_verification", error_msg)
+                raise AssertionError(error_msg)
+            
+            # Find the item container by name using Playwright's :has and :has-text
+            item_container = page.locator(f'.inventory_item:has(.inventory_item_name:has-text("{item["name"]}"))').first
+            
+            # Add to cart
+            add_to_cart_button = item_container.locator('.btn_inventory')
+            add_to_cart_button.click()
+            total_cents += actual_cents
+            
+            # Wait for the cart badge to show the new count
+            badge_count += 1
+            expect(cart_badge).to_have_text(str(badge_count))
+    
+    return total_cents
+
+# Reads the app's numeric item ids (from the "item_<id>_title_link" anchors) keyed by product name
+_INVENTORY_IDS_SCRIPT = """
+() => {
+    const ids = {};
+    document.querySelectorAll('.inventory_item').forEach((el) => {
+        const link = el.querySelector('a[id$="_title_link"]');
+        const match = link && link.id.match(/^item_(\\d+)_title_link$/);
+        if (match) {
+            ids[el.querySelector('.inventory_item_name').textContent.trim()] = parseInt(match[1], 10);
+        }
+    });
+    return ids;
+}
+"""
+
+def resolve_item_ids(page, items):
+    """Return the app's item id for each item, looking up any without an "id" on the inventory page"""
+    missing = [item['name'] for item in items if 'id' not in item]
+    inventory_ids = page.evaluate(_INVENTORY_IDS_SCRIPT) if missing else {}
+
+    item_ids = []
     for item in items:
-        # Find the item container by name using Playwright's :has and :has-text
-        item_container = page.locator(f'.inventory_item:has(.inventory_item_name:has-text("{item["name"]}"))').first
-        if not item_container:
+        if 'id' in item:
+            item_ids.append(item['id'])
+        elif item['name'] in inventory_ids:
+            item_ids.append(inventory_ids[item['name']])
+        else:
             raise AssertionError(f"Item not found: {item['name']}")
-        
-        # Get the price from within the container
-        price_element = item_container.locator('.inventory_item_price')
-        price_text = price_element.text_content()
-        actual_price = float(price_text.replace('$', ''))
-        
-        # Verify price
-        if actual_price != item['expected_price']:
-            error_msg = f"Price mismatch for {item['name']}: expected ${item['expected_price']}, got ${actual_price}"
+    return item_ids
+
+@traced("seed_cart")
+def seed_cart(page, items, base_url=BASE_URL):
+    """Set the cart in localStorage and open the cart page; must be called while logged in"""
+    item_ids = resolve_item_ids(page, items)
+    page.evaluate("ids => localStorage.setItem('cart-contents', JSON.stringify(ids))", item_ids)
+    page.goto(f'{base_url}/cart.html')
+    page.wait_for_load_state('networkidle')
+    return sum(to_cents(item['expected_price']) for item in items)
+
+# Reads every checkout-step-two amount in one round trip
+_SUMMARY_SCRIPT = """
+() => {
+    const text = (selector) => {
+        const el = document.querySelector(selector);
+        return el ? el.textContent : null;
+    };
+    return {
+        lines: Array.from(document.querySelectorAll('.cart_item .inventory_item_price'), (el) => el.textContent),
+        subtotal: text('.summary_subtotal_label'),
+        tax: text('.summary_tax_label'),
+        total: text('.summary_total_label'),
+    };
+}
+"""
+
+# Reads every cart line's name and price in one round trip
+_CART_LINES_SCRIPT = """
+(items) => items.map((el) => ({
+    name: el.querySelector('.inventory_item_name').textContent.trim(),
+    price: el.querySelector('.inventory_item_price').textContent,
+}))
+"""
+
+@traced("verify_cart")
+def verify_cart(page, expected_count, expected_total, expected_items=None):
+    """Verify cart count, each expected item's price by name and the total (in cents); on checkout-step-two, the summary"""
+    if page.url.endswith('/checkout-step-two.html'):
+        verify_checkout_summary(page, expected_count, expected_total)
+        return
+
+    # One round trip for every line; the count comes from the same list
+    cart_lines = page.locator('.cart_item').evaluate_all(_CART_LINES_SCRIPT)
+    assert len(cart_lines) == expected_count, f"Cart should have {expected_count} items, found {len(cart_lines)}"
+    logging.info(f"Verified cart contains {len(cart_lines)} items")
+
+    cart_prices = {line['name']: parse_cents(line['price']) for line in cart_lines}
+    for item in expected_items or []:
+        if item['name'] not in cart_prices:
+            raise AssertionError(f"Item missing from cart: {item['name']}")
+        expected_cents = to_cents(item['expected_price'])
+        if cart_prices[item['name']] != expected_cents:
+            error_msg = (f"Price mismatch for {item['name']}: expected {format_cents(expected_cents)}, "
+                         f"got {format_cents(cart_prices[item['name']])}")
             logging.error(error_msg)
             log_form_validation_error("price_verification", error_msg)
             raise AssertionError(error_msg)
-        
-        # Add to cart
-        add_to_cart_button = item_container.locator('.btn_inventory')
-        add_to_cart_button.click()
-        total_price += actual_price
-        
-        # Wait for cart badge to update
-        page.wait_for_timeout(500)  # Small delay to ensure cart updates
-    
-    return total_price
-
-def verify_cart(page, expected_count, expected_total):
-    """Verify cart contents and (if on summary page) total price"""
-    # On the cart page, check item count
-    cart_items = page.locator('.cart_item').all()
-    assert len(cart_items) == expected_count, f"Cart should have {expected_count} items, found {len(cart_items)}"
-    logging.info(f"Verified cart contains {len(cart_items)} items")
-
-    # Optionally, check item prices on the cart page
-    cart_prices = [float(item.locator('.inventory_item_price').text_content().replace('$', '')) for item in cart_items]
-    total_cart_price = sum(cart_prices)
-    assert abs(total_cart_price - expected_total) < 0.01, f"Cart total mismatch: expected ${expected_total}, got ${total_cart_price}"
-    logging.info(f"Verified cart total price: ${total_cart_price:.2f}")
-
-    # If on the summary page, check the summary subtotal
-    if page.url.endswith('/checkout-step-two.html'):
-        total_element = page.locator('.summary_subtotal_label')
-        total_text = total_element.text_content()
-        subtotal = float(total_text.replace('Item total: $', ''))
-        assert abs(subtotal - expected_total) < 0.01, f"Summary subtotal mismatch: expected ${expected_total}, got ${subtotal}"
-        logging.info(f"Verified summary subtotal: ${subtotal:.2f}")
+
+    total_cents = sum(parse_cents(line['price']) for line in cart_lines)
+    assert total_cents == expected_total, \
+        f"Cart total mismatch: expected {format_cents(expected_total)}, got {format_cents(total_cents)}"
+    logging.info(f"Verified cart total price: {format_cents(total_cents)}")
+
+@traced("verify_checkout_summary")
+def verify_checkout_summary(page, expected_count=None, expected_subtotal=None):
+    """Check line items, subtotal, tax and total on checkout-step-two exactly, in cents"""
+    summary = page.evaluate(_SUMMARY_SCRIPT)
+    line_cents = [parse_cents(price) for price in summary['lines']]
+    if expected_count is not None:
+        assert len(line_cents) == expected_count, \
+            f"Summary should list {expected_count} items, found {len(line_cents)}"
+
+    subtotal = parse_cents(summary['subtotal'])
+    tax = parse_cents(summary['tax'])
+    total = parse_cents(summary['total'])
+
+    assert subtotal == sum(line_cents), \
+        f"Summary subtotal {format_cents(subtotal)} does not match line items {format_cents(sum(line_cents))}"
+    if expected_subtotal is not None:
+        assert subtotal == expected_subtotal, \
+            f"Summary subtotal mismatch: expected {format_cents(expected_subtotal)}, got {format_cents(subtotal)}"
+    assert tax == expected_tax_cents(subtotal), \
+        f"Tax mismatch: expected {format_cents(expected_tax_cents(subtotal))}, got {format_cents(tax)}"
+    assert total == subtotal + tax, \
+        f"Total mismatch: expected {format_cents(subtotal + tax)}, got {format_cents(total)}"
+    logging.info(f"Verified summary: subtotal {format_cents(subtotal)}, tax {format_cents(tax)}, total {format_cents(total)}")
 
 def normalize_text(text):
     # Lowercase, remove punctuation, and strip whitespace
     return re.sub(r'[^a-z0-9]', '', text.lower())
 
-def perform_checkout(page, test_case):
-    """Perform checkout process"""
+@traced("perform_checkout")
+def perform_checkout(page, test_case, expected_total=None):
+    """Perform checkout process, checking the step-two amounts against expected_total (cents) when given"""
     # Click checkout button
     page.click('#checkout')
     
     # Fill checkout information
-    if 'checkout_info' in test_case:
-        info = test_case['checkout_info']
-        page.fill('#first-name', info.get('first_name', 'John'))
-        page.fill('#last-name', info.get('last_name', 'Doe'))
-        page.fill('#postal-code', info.get('postal_code', '12345'))
-    else:
-        page.fill('#first-name', 'John')
-        page.fill('#last-name', 'Doe')
-        page.fill('#postal-code', '12345')
+    with span("fill_checkout_info"):
+        if 'checkout_info' in test_case:
+            info = test_case['checkout_info']
+            page.fill('#first-name', info.get('first_name', 'John'))
+            page.fill('#last-name', info.get('last_name', 'Doe'))
+            page.fill('#postal-code', info.get('postal_code', '12345'))
+        else:
+            page.fill('#first-name', 'John')
+            page.fill('#last-name', 'Doe')
+            page.fill('#postal-code', '12345')
     
     # Continue to next step
-    page.click('#continue')
+    with span("continue_checkout"):
+        page.click('#continue')
     
     # Check for errors
     error_element = page.locator('[data-test="error"]')
@@ -118,13 +235,18 @@ def perform_checkout(page, test_case):
             return False
         raise AssertionError(f"Unexpected checkout error: {error_message}")
     
-    # Complete checkout
-    page.click('#finish')
+    # Verify item total, tax and total before finishing
+    page.wait_for_url(lambda url: url.endswith('/checkout-step-two.html'), timeout=10000)
+    verify_checkout_summary(page, expected_subtotal=expected_total)
     
-    # Wait for confirmation page
-    page.wait_for_url(lambda url: url.endswith('/checkout-complete.html'), timeout=10000)
-    complete_header = page.locator('.complete-header')
-    complete_header.wait_for(state='visible', timeout=5000)
+    # Complete checkout
+    with span("finish_order"):
+        page.click('#finish')
+        
+        # Wait for confirmation page
+        page.wait_for_url(lambda url: url.endswith('/checkout-complete.html'), timeout=10000)
+        complete_header = page.locator('.complete-header')
+        complete_header.wait_for(state='visible', timeout=5000)
 
     # Log the actual header text for debugging
     header_text = complete_header.text_content()
@@ -140,8 +262,28 @@ def perform_checkout(page, test_case):
     
     return True
 
-def run_cart_test(page, test_case):
-    """Run a single cart/checkout test case"""
+@traced("login")
+def login(page, username, password, base_url=BASE_URL):
+    """Log in through the login form and wait for the inventory page to settle"""
+    logging.info("Navigating to website")
+    page.goto(f'{base_url}/')
+    logging.info("Filling login form")
+    page.fill('#user-name', username)
+    page.fill('#password', password)
+    logging.info("Clicking login button")
+    page.click('#login-button')
+    page.wait_for_load_state('networkidle')
+
+@traced("reset_app_state")
+def reset_app_state(page, base_url=BASE_URL):
+    """Empty the cart and return to the inventory page; returns False if the session has expired"""
+    page.evaluate("() => localStorage.removeItem('cart-contents')")
+    page.goto(f'{base_url}/inventory.html')
+    page.wait_for_load_state('networkidle')
+    return '/inventory.html' in page.url
+
+def run_cart_test(page, test_case, logged_in=False):
+    """Run a single cart/checkout test case; returns the number of logins it performed"""
     test_case_name = test_case['name']
     username = test_case['username']
     password = test_case['password']
@@ -149,60 +291,90 @@ def run_cart_test(page, test_case):
     expected_error_message = test_case.get('expected_error_message', None)
 
     logging.info(f"Starting test case: {test_case_name}")
-    try:
-        # Login
-        logging.info("Navigating to website")
-        page.goto('https://www.saucedemo.com/')
-        logging.info("Filling login form")
-        page.fill('#user-name', username)
-        page.fill('#password', password)
-        logging.info("Clicking login button")
-        page.click('#login-button')
-        page.wait_for_load_state('networkidle')
-
-        # Add items to cart
-        logging.info("Adding items to cart")
-        total_price = add_items_to_cart(page, test_case['items'])
-        logging.info(f"Total price: ${total_price:.2f}")
-
-        # Navigate to cart page before verifying cart
-        page.click('.shopping_cart_link')
-        page.wait_for_load_state('networkidle')
-
-        # Verify cart contents
-        verify_cart(page, len(test_case['items']), total_price)
-
-        # Perform checkout
-        logging.info("Starting checkout process")
-        checkout_success = perform_checkout(page, test_case)
-        
-        if test_case['expected_result'] == 'success':
-            assert checkout_success, "Checkout should succeed"
-        else:
-            assert not checkout_success, "Checkout should fail"
-        
-        logging.info(f"Test case completed: {test_case_name}")
-        
-    except Exception as e:
-        logging.error(f"Test failed: {str(e)}")
-        capture_failure_screenshot(page, test_case_name)
-        log_form_validation_error(test_case_name, str(e))
-        raise
+    with span(f"cart_case[{test_case_name}]"):
+        try:
+            # Reuse the session from the previous case for this user when there is one
+            logins = 0
+            if not (logged_in and reset_app_state(page)):
+                login(page, username, password)
+                logins = 1
 
-def run_all_tests():
-    """Run all test cases"""
+            if test_case.get('add_items_via_ui'):
+                # Add items to cart
+                logging.info("Adding items to cart")
+                total_price = add_items_to_cart(page, test_case['items'])
+
+                # Navigate to cart page before verifying cart
+                with span("open_cart"):
+                    page.click('.shopping_cart_link')
+                    page.wait_for_load_state('networkidle')
+            else:
+                # The add-to-cart UI isn't under test here, so write the cart directly
+                logging.info("Seeding cart via localStorage")
+                total_price = seed_cart(page, test_case['items'])
+            logging.info(f"Total price: {format_cents(total_price)}")
+
+            # Verify cart contents
+            verify_cart(page, len(test_case['items']), total_price, test_case['items'])
+
+            # Perform checkout
+            logging.info("Starting checkout process")
+            checkout_success = perform_checkout(page, test_case, total_price)
+            
+            if test_case['expected_result'] == 'success':
+                assert checkout_success, "Checkout should succeed"
+            else:
+                assert not checkout_success, "Checkout should fail"
+            
+            logging.info(f"Test case completed: {test_case_name}")
+            return logins
+            
+        except Exception as e:
+            logging.error(f"Test failed: {str(e)}")
+            capture_failure_screenshot(page, test_case_name)
+            log_form_validation_error(test_case_name, str(e))
+            raise
+
+def run_cart_group(page, group, counter):
+    """Run every case for one user in the same authenticated page, logging in only when needed"""
+    logging.info(f"Running {len(group['cases'])} cart cases as {group['username']}")
+    logged_in = False
+    for test_case in group['cases']:
+        logins = run_cart_test(page, test_case, logged_in=logged_in)
+        counter.add(logins=logins, cases=1)
+        logged_in = True
+
+def run_cart_worker(worker_id, groups, counter, browser=None):
+    """Run a worker's user groups, each in its own browser context"""
+    with ensure_browser(browser) as active_browser:
+        for group in groups:
+            context = active_browser.new_context()
+            try:
+                run_cart_group(context.new_page(), group, counter)
+            finally:
+                context.close()
+    logging.info(f"Cart worker {worker_id} finished {len(groups)} user groups")
+
+def run_all_tests(workers=TEST_WORKERS, browser=None):
+    """Run all test cases, grouped by user and spread over the given number of workers"""
     logging.info("Starting cart tests")
     
     try:
+        if browser is not None and workers > 1:
+            # Playwright sync objects are bound to their thread, so a shared browser means one worker
+            logging.info("Using the provided browser with a single worker")
+            workers = 1
         test_cases = load_test_cases()
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=False)
-            page = browser.new_page()
-            
-            for test_case in test_cases:
-                run_cart_test(page, test_case)
-            
-            browser.close()
+        groups = group_cases_by_user(test_cases)
+        assignments = assign_groups_to_workers(groups, workers)
+        logging.info(f"Scheduled {len(test_cases)} cart cases in {len(groups)} user groups on {len(assignments)} workers")
+
+        counter = LoginCounter()
+        run_worker_assignments(
+            assignments,
+            lambda worker_id, worker_groups: run_cart_worker(worker_id, worker_groups, counter, browser),
+        )
+        counter.log_summary("Cart tests")
         
         logging.info("All cart tests completed successfully")
         return True
@@ -211,4 +383,7 @@ def run_all_tests():
         raise
 
 if __name__ == '__main__':
-    run_all_tests() 
\ No newline at end of file
+    try:
+        run_all_tests()
+    finally:
+        export_trace() 
\ No newline at end of file
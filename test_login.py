@@ -1,9 +1,13 @@
-from playwright.sync_api import sync_playwright, expect
+from playwright.sync_api import expect
 import json
 import time
 import os
 from datetime import datetime
 import logging
+from tracing import span, traced, export_trace
+from settings import BASE_URL
+from browser_session import ensure_browser
+from page_assertions import build_assertion_specs, evaluate_assertions, assert_all_passed
 
 # Configure logging
 def setup_logging():
@@ -43,6 +47,7 @@ def log_form_validation_error(test_case_name, error_message):
     with open('logs/validation_errors.log', 'a') as f:
         f.write(log_entry)
 
+@traced("capture_failure_screenshot")
 def capture_failure_screenshot(page, test_case_name):
     logging.info(f"Capturing failure screenshot for test case: {test_case_name}")
     # Create screenshots directory if it doesn't exist
@@ -56,36 +61,24 @@ def capture_failure_screenshot(page, test_case_name):
     page.screenshot(path=screenshot_path)
     logging.info(f"Screenshot captured: {screenshot_path}")
 
-def perform_additional_validations(page, test_case):
-    if 'additional_validations' not in test_case:
-        return
+# Default checks for every successful login; a case's additional_validations override them
+LOGIN_SUCCESS_VALIDATIONS = {
+    'check_inventory_count': True,
+    'check_cart_empty': True,
+    'check_menu_visible': True,
+}
+
+@traced("additional_validations")
+def perform_additional_validations(page, test_case, required_validations=None):
+    """Evaluate required_validations overlaid with the case's additional_validations in a single page call"""
+    validations = {**(required_validations or {}), **test_case.get('additional_validations', {})}
+    if not validations:
+        return []
 
-    validations = test_case['additional_validations']
     logging.info(f"Performing additional validations for test case: {test_case['name']}")
-    
-    if validations.get('check_inventory_count'):
-        logging.info("Checking inventory count")
-        inventory_items = page.locator('.inventory_item').all()
-        assert len(inventory_items) > 0, "Inventory should contain items"
-        logging.info(f"Verified inventory contains {len(inventory_items)} items")
-    
-    if validations.get('check_cart_empty'):
-        logging.info("Checking if cart is empty")
-        cart_badge = page.locator('.shopping_cart_badge')
-        assert not cart_badge.is_visible(), "Cart should be empty initially"
-        logging.info("Verified cart is empty")
-    
-    if validations.get('check_menu_visible'):
-        logging.info("Checking if menu button is visible")
-        menu_button = page.locator('#react-burger-menu-btn')
-        assert menu_button.is_visible(), "Menu button should be visible"
-        logging.info("Verified menu button is visible")
-        
-    if validations.get('check_nonexistent_element'):
-        logging.info("Checking for nonexistent element (expected to fail)")
-        nonexistent_element = page.locator('#this-element-does-not-exist')
-        assert not nonexistent_element.is_visible(), "This element should not be visible as it doesn't exist"
-        logging.info("Verified nonexistent element is not visible")
+    results = evaluate_assertions(page, build_assertion_specs(validations))
+    assert_all_passed(results)
+    return results
 
 def run_login_test(page, test_case):
     """Run a single login test case"""
@@ -98,96 +91,85 @@ def run_login_test(page, test_case):
     logging.info(f"Starting test case: {test_case_name}")
     logging.info(f"Username: {username}")
     
-    try:
-        # Navigate to website
-        logging.info("Navigating to website")
-        page.goto('https://www.saucedemo.com/')
-        
-        # Fill login form
-        logging.info("Filling login form")
-        page.fill('#user-name', username)
-        page.fill('#password', password)
-        
-        # Click login button
-        logging.info("Clicking login button")
-        page.click('#login-button')
-        
-        # Wait for page load
-        logging.info("Waiting for page load")
-        start_time = time.time()
-        page.wait_for_load_state('networkidle')
-        end_time = time.time()
-        
-        # Calculate response time
-        response_time = (end_time - start_time) * 1000  # Convert to milliseconds
-        logging.info(f"Response time: {response_time:.2f}ms")
-        
-        # Check response time against threshold
-        threshold = 6000 if username == 'performance_glitch_user' else 4000
-        logging.info(f"Checking response time against threshold: {threshold}ms")
-        assert response_time <= threshold, f"Response time {response_time:.2f}ms exceeded threshold of {threshold}ms"
-        logging.info("Response time check passed")
-        
-        # Verify URL contains expected path
-        logging.info("Verifying URL contains expected path")
-        if expected_result == 'success':
-            assert '/inventory.html' in page.url, "Failed to reach inventory page"
-            logging.info(f"Successfully logged in as {username}")
+    with span(f"login_case[{test_case_name}]"):
+        try:
+            # Navigate to website
+            with span("navigate"):
+                logging.info("Navigating to website")
+                page.goto(f'{BASE_URL}/')
             
-            # Perform additional validations for successful login
-            logging.info(f"Performing additional validations for test case: {test_case_name}")
+            # Fill login form
+            with span("fill_login_form"):
+                logging.info("Filling login form")
+                page.fill('#user-name', username)
+                page.fill('#password', password)
             
-            # Check inventory count
-            logging.info("Checking inventory count")
-            inventory_items = page.locator('.inventory_item').all()
-            assert len(inventory_items) == 6, "Inventory should contain 6 items"
-            logging.info(f"Verified inventory contains {len(inventory_items)} items")
+            # Click login button
+            with span("submit_login"):
+                logging.info("Clicking login button")
+                page.click('#login-button')
             
-            # Check if cart is empty
-            logging.info("Checking if cart is empty")
-            cart_badge = page.locator('.shopping_cart_badge')
-            assert not cart_badge.is_visible(), "Cart should be empty"
-            logging.info("Verified cart is empty")
+            # Wait for page load
+            with span("wait_for_load"):
+                logging.info("Waiting for page load")
+                start_time = time.time()
+                page.wait_for_load_state('networkidle')
+                end_time = time.time()
             
-            # Check if menu button is visible
-            logging.info("Checking if menu button is visible")
-            menu_button = page.locator('#react-burger-menu-btn')
-            assert menu_button.is_visible(), "Menu button should be visible"
-            logging.info("Verified menu button is visible")
+            # Calculate response time
+            response_time = (end_time - start_time) * 1000  # Convert to milliseconds
+            logging.info(f"Response time: {response_time:.2f}ms")
             
-        else:
-            # Check for error message
-            error_element = page.locator('[data-test="error"]')
-            assert error_element.is_visible(), "Error message should be visible"
-            error_message = error_element.text_content()
-            logging.info(f"Received error message: {error_message}")
+            # Check response time against threshold
+            threshold = 6000 if username == 'performance_glitch_user' else 4000
+            logging.info(f"Checking response time against threshold: {threshold}ms")
+            assert response_time <= threshold, f"Response time {response_time:.2f}ms exceeded threshold of {threshold}ms"
+            logging.info("Response time check passed")
             
-            if expected_error_message:
-                assert expected_error_message in error_message, \
-                    f"Expected error message '{expected_error_message}' not found in '{error_message}'"
-        
-        logging.info(f"Test case completed: {test_case_name}")
-        
-    except Exception as e:
-        logging.error(f"Test failed: {str(e)}")
-        capture_failure_screenshot(page, test_case_name)
-        log_form_validation_error(test_case_name, str(e))
-        raise
+            # Verify URL contains expected path
+            logging.info("Verifying URL contains expected path")
+            if expected_result == 'success':
+                assert '/inventory.html' in page.url, "Failed to reach inventory page"
+                logging.info(f"Successfully logged in as {username}")
+                
+                # Perform additional validations for successful login
+                with span("verify_inventory_page"):
+                    perform_additional_validations(page, test_case, LOGIN_SUCCESS_VALIDATIONS)
+                
+            else:
+                # Check for error message
+                with span("verify_error_message"):
+                    error_element = page.locator('[data-test="error"]')
+                    assert error_element.is_visible(), "Error message should be visible"
+                    error_message = error_element.text_content()
+                    logging.info(f"Received error message: {error_message}")
+                    
+                    if expected_error_message:
+                        assert expected_error_message in error_message, \
+                            f"Expected error message '{expected_error_message}' not found in '{error_message}'"
+            
+            logging.info(f"Test case completed: {test_case_name}")
+            
+        except Exception as e:
+            logging.error(f"Test failed: {str(e)}")
+            capture_failure_screenshot(page, test_case_name)
+            log_form_validation_error(test_case_name, str(e))
+            raise
 
-def run_all_tests():
-    """Run all test cases"""
+def run_all_tests(browser=None):
+    """Run all test cases, reusing `browser` when one is passed in"""
     logging.info("Starting test suite")
     
     try:
         test_cases = load_test_cases()
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=False)
-            page = browser.new_page()
-            
-            for test_case in test_cases:
-                run_login_test(page, test_case)
-            
-            browser.close()
+        with ensure_browser(browser) as active_browser:
+            context = active_browser.new_context()
+            try:
+                page = context.new_page()
+                for test_case in test_cases:
+                    run_login_test(page, test_case)
+            finally:
+                context.close()
             
         logging.info("Test suite completed successfully")
         return True
@@ -199,4 +181,7 @@ def run_all_tests():
 if __name__ == "__main__":
     # Ensure test_data directory exists
     os.makedirs('test_data', exist_ok=True)
-    run_all_tests() 
\ No newline at end of file
+    try:
+        run_all_tests()
+    finally:
+        export_trace() 
\ No newline at end of file
@@ -1,9 +1,13 @@
-from playwright.sync_api import sync_playwright
 import csv
 import os
 import logging
 from datetime import datetime
+from tracing import span, traced, export_trace
+from settings import BASE_URL
+from browser_session import ensure_browser
+from asset_verification import verify_product_assets
 
+@traced("capture_failure_screenshot")
 def capture_failure_screenshot(page, test_name):
     """Capture screenshot on test failure"""
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -11,50 +15,59 @@ def capture_failure_screenshot(page, test_name):
     page.screenshot(path=screenshot_path)
     logging.info(f"Screenshot captured: {screenshot_path}")
 
-def scrape_product_data():
-    """Scrape product data from the website"""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
+@traced("extract_products")
+def extract_product_data(page):
+    """Collect name, description, price and image URL for every product on the inventory page"""
+    logging.info("Collecting product data")
+    products = page.locator('.inventory_item').all()
+    
+    # Prepare data for CSV
+    product_data = []
+    for product in products:
+        data = {
+            'name': product.locator('.inventory_item_name').text_content(),
+            'description': product.locator('.inventory_item_desc').text_content(),
+            'price': product.locator('.inventory_item_price').text_content(),
+            'image_url': product.locator('img.inventory_item_img').get_attribute('src')
+        }
+        product_data.append(data)
+    return product_data
+
+@traced("scrape_product_data")
+def scrape_product_data(browser=None):
+    """Scrape product data from the website, reusing `browser` when one is passed in"""
+    with ensure_browser(browser) as active_browser:
+        context = active_browser.new_context()
+        page = context.new_page()
         
         try:
             # Login first
-            logging.info("Navigating to website")
-            page.goto('https://www.saucedemo.com')
-            
-            logging.info("Logging in")
-            page.fill('#user-name', 'standard_user')
-            page.fill('#password', 'secret_sauce')
-            page.click('#login-button')
-            
-            # Wait for the inventory page to load
-            logging.info("Waiting for inventory page to load")
-            page.wait_for_load_state('networkidle')
+            with span("login"):
+                logging.info("Navigating to website")
+                page.goto(f'{BASE_URL}/')
+                
+                logging.info("Logging in")
+                page.fill('#user-name', 'standard_user')
+                page.fill('#password', 'secret_sauce')
+                page.click('#login-button')
+                
+                # Wait for the inventory page to load
+                logging.info("Waiting for inventory page to load")
+                page.wait_for_load_state('networkidle')
             
             # Verify we're on the inventory page
             assert '/inventory.html' in page.url, "Failed to reach inventory page"
             
             # Get all product elements
-            logging.info("Collecting product data")
-            products = page.locator('.inventory_item').all()
-            
-            # Prepare data for CSV
-            product_data = []
-            for product in products:
-                data = {
-                    'name': product.locator('.inventory_item_name').text_content(),
-                    'description': product.locator('.inventory_item_desc').text_content(),
-                    'price': product.locator('.inventory_item_price').text_content(),
-                    'image_url': product.locator('img.inventory_item_img').get_attribute('src')
-                }
-                product_data.append(data)
+            product_data = extract_product_data(page)
             
             # Save to CSV
             csv_file = 'products.csv'
-            with open(csv_file, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=['name', 'description', 'price', 'image_url'])
-                writer.writeheader()
-                writer.writerows(product_data)
+            with span("write_csv"):
+                with open(csv_file, 'w', newline='', encoding='utf-8') as file:
+                    writer = csv.DictWriter(file, fieldnames=['name', 'description', 'price', 'image_url'])
+                    writer.writeheader()
+                    writer.writerows(product_data)
             
             logging.info(f"Successfully saved {len(product_data)} products to {csv_file}")
             return True
@@ -65,15 +78,18 @@ def scrape_product_data():
             raise
             
         finally:
-            browser.close()
+            context.close()
 
-def run_all_tests():
+def run_all_tests(browser=None):
     """Run all product data tests"""
     logging.info("Starting product data tests")
     
     try:
-        success = scrape_product_data()
+        success = scrape_product_data(browser)
         if success:
+            # Confirm every scraped image actually loads
+            _, broken = verify_product_assets()
+            assert not broken, f"{len(broken)} product images failed to load"
             logging.info("All product data tests completed successfully")
             return True
         else:
@@ -84,4 +100,7 @@ def run_all_tests():
         raise
 
 if __name__ == "__main__":
-    run_all_tests() 
\ No newline at end of file
+    try:
+        run_all_tests()
+    finally:
+        export_trace() 
\ No newline at end of file
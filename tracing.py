@@ -0,0 +1,166 @@
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+# Tracing is off unless AUTOMATION_TRACE is set (or enable_tracing() is called)
+_enabled = os.environ.get('AUTOMATION_TRACE', '').lower() in ('1', 'true', 'yes', 'on')
+
+# Context variables (unlike thread-locals) follow Prefect tasks into worker threads
+_current = contextvars.ContextVar('current_span', default=None)
+_roots = []
+_roots_lock = threading.Lock()
+_epoch = time.perf_counter()
+
+
+class _Span:
+    """A single timed step; nests under whichever span is currently open"""
+    __slots__ = ('name', 'start', 'end', 'children', 'error', '_token')
+
+    def __init__(self, name):
+        self.name = name
+        self.start = None
+        self.end = None
+        self.children = []
+        self.error = None
+        self._token = None
+
+    def __enter__(self):
+        parent = _current.get()
+        if parent is not None:
+            parent.children.append(self)
+        else:
+            with _roots_lock:
+                _roots.append(self)
+        self._token = _current.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        _current.reset(self._token)
+        return False
+
+    @property
+    def duration_ms(self):
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+    def to_dict(self):
+        data = {
+            'name': self.name,
+            'start_ms': round((self.start - _epoch) * 1000, 3),
+            'duration_ms': round(self.duration_ms, 3),
+            'children': [child.to_dict() for child in self.children],
+        }
+        if self.error:
+            data['error'] = self.error
+        return data
+
+
+class _NullSpan:
+    """Shared no-op span returned while tracing is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def enable_tracing(enabled=True):
+    """Turn span collection on or off at runtime"""
+    global _enabled
+    _enabled = enabled
+
+
+def is_tracing_enabled():
+    return _enabled
+
+
+def span(name):
+    """Context manager timing a step, e.g. `with span("fill_login_form"):`"""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def traced(name=None):
+    """Decorator timing every call of a function as a span"""
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def reset_trace():
+    """Discard all recorded spans"""
+    with _roots_lock:
+        _roots.clear()
+
+
+def get_trace():
+    """Return the recorded span trees as plain dicts"""
+    with _roots_lock:
+        return [root.to_dict() for root in _roots]
+
+
+def _collapse(node, prefix, lines):
+    frame = node['name'].replace(';', ':').replace(' ', '_')
+    path = f"{prefix};{frame}" if prefix else frame
+    child_ms = sum(child['duration_ms'] for child in node['children'])
+    # Collapsed stacks weight each frame by its self time, in microseconds
+    self_us = int(round(max(node['duration_ms'] - child_ms, 0) * 1000))
+    if self_us > 0:
+        lines.append(f"{path} {self_us}")
+    for child in node['children']:
+        _collapse(child, path, lines)
+
+
+def to_collapsed_stacks(trees):
+    """Render span trees in the folded format read by flamegraph.pl / speedscope"""
+    lines = []
+    for tree in trees:
+        _collapse(tree, '', lines)
+    return '\n'.join(lines) + ('\n' if lines else '')
+
+
+def export_trace(output_dir='logs', prefix='trace'):
+    """Write the recorded spans as JSON and collapsed stacks; returns the paths written"""
+    if not _enabled:
+        return None
+
+    trees = get_trace()
+    if not trees:
+        logging.info("No spans recorded, skipping trace export")
+        return None
+
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    json_path = os.path.join(output_dir, f'{prefix}_{timestamp}.json')
+    folded_path = os.path.join(output_dir, f'{prefix}_{timestamp}.folded')
+
+    with open(json_path, 'w') as f:
+        json.dump({'generated_at': datetime.now().isoformat(), 'spans': trees}, f, indent=2)
+    with open(folded_path, 'w') as f:
+        f.write(to_collapsed_stacks(trees))
+
+    logging.info(f"Trace report written: {json_path}, {folded_path}")
+    return json_path, folded_path